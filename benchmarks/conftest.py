@@ -0,0 +1,109 @@
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+BASELINE = Path(__file__).parent / "baseline.json"
+RESULTS = Path(__file__).parent / "results.json"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--baseline",
+        default=str(BASELINE),
+        help="JSON file with the timings to compare against",
+    )
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        help="overwrite the baseline with the timings of this run",
+    )
+    group.addoption(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown relative to the baseline, as a fraction",
+    )
+    group.addoption(
+        "--rounds", type=int, default=5, help="repetitions of each measurement"
+    )
+
+
+class Recorder:
+    def __init__(self, config: pytest.Config) -> None:
+        """Initialize a recorder that compares timings against a baseline."""
+        self.path: Path = Path(config.getoption("--baseline"))
+        self.update: bool = config.getoption("--update-baseline")
+        self.threshold: float = config.getoption("--threshold")
+        self.rounds: int = config.getoption("--rounds")
+        self.baseline: dict[str, float] = {}
+        if self.path.exists():
+            self.baseline = json.loads(self.path.read_text())
+        self.results: dict[str, float] = {}
+
+    def measure(
+        self,
+        name: str,
+        fn: Callable[..., object],
+        setup: Optional[Callable[[], tuple]] = None,
+    ) -> float:
+        """Time the best of several runs of a function and check it for regression."""
+        best = None
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(self.rounds):
+                args = setup() if setup is not None else ()
+                start = time.perf_counter()
+                fn(*args)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+        finally:
+            if enabled:
+                gc.enable()
+        self.results[name] = best
+
+        reference = self.baseline.get(name)
+        if not self.update and reference is not None:
+            limit = reference * (1 + self.threshold)
+            if best > limit:
+                pytest.fail(
+                    f"{name} took {best * 1000:.3f} ms, more than {limit * 1000:.3f} ms "
+                    f"({self.threshold:.0%} over the baseline of "
+                    f"{reference * 1000:.3f} ms)"
+                )
+        return best
+
+    def save(self) -> None:
+        """Write the results, and the baseline when updating or missing."""
+        RESULTS.write_text(json.dumps(self.results, indent=2, sort_keys=True) + "\n")
+        if self.update or not self.path.exists():
+            baseline = {**self.baseline, **self.results}
+            self.path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+recorder_key = pytest.StashKey[Recorder]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[recorder_key] = Recorder(config)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    recorder = session.config.stash.get(recorder_key, None)
+    if recorder is not None and recorder.results:
+        recorder.save()
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Callable[..., float]:
+    """Measure a function under the name of the running test."""
+    recorder = request.config.stash[recorder_key]
+    return lambda fn, setup=None: recorder.measure(request.node.name, fn, setup)
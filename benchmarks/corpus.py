@@ -0,0 +1,59 @@
+import random
+from functools import lru_cache
+
+from config import DEFAULT_GRID_SIZE
+from block import Block
+from selection import Selection
+from grid import Grid
+from benchmark import random_position
+from solver import solve
+from spawner import Spawner
+
+
+SEEDS = [0, 1, 2]
+MIDGAME_MOVES = 12
+LATEGAME_MOVES = 40
+POSITIONS = 20
+
+Position = tuple[list[list], list[Block]]
+
+
+@lru_cache(maxsize=None)
+def positions(seed: int, moves: int, count: int = POSITIONS) -> tuple[Position, ...]:
+    """Generate a seeded set of grids reached by random play, each with a hand."""
+    rng = random.Random(seed)
+    return tuple(random_position(rng, moves) for _ in range(count))
+
+
+@lru_cache(maxsize=None)
+def hands(seed: int, solvable: bool, count: int = POSITIONS) -> tuple[Position, ...]:
+    """Collect late-game positions whose hand is or is not solvable."""
+    rng = random.Random(seed)
+    found = []
+    while len(found) < count:
+        values, hand = random_position(rng, LATEGAME_MOVES)
+        grid = Grid(values=[row[:] for row in values])
+        if (solve(grid, Selection([b.copy() for b in hand])) is not None) == solvable:
+            found.append((values, hand))
+    return tuple(found)
+
+
+@lru_cache(maxsize=None)
+def dense_grids(seed: int, count: int = 5, pool: int = 200) -> tuple[list[list], ...]:
+    """Pick the dense grids on which completing a spawn tries the most hands."""
+    rng = random.Random(seed)
+    scored = []
+    for _ in range(pool):
+        density = rng.uniform(0.6, 0.85)
+        grid = Grid(
+            values=[
+                [int(rng.random() < density) for _ in range(DEFAULT_GRID_SIZE)]
+                for _ in range(DEFAULT_GRID_SIZE)
+            ]
+        )
+        grid.clear_full()
+        spawner = Spawner(fallback="exhaustive", rng=random.Random(seed))
+        spawner.spawn(grid)
+        scored.append((spawner.last_stats.hands_tried, grid.values))
+    scored.sort(key=lambda s: s[0], reverse=True)
+    return tuple(values for _, values in scored[:count])
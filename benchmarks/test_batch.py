@@ -0,0 +1,25 @@
+import pytest
+
+from block import Block
+from grid import Grid
+from solver import get_num_cleared
+
+from corpus import SEEDS, LATEGAME_MOVES, positions
+
+np = pytest.importorskip("numpy")
+batch = pytest.importorskip("batch")
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_batch_evaluate(bench, seed: int) -> None:
+    grids = [Grid(values=v) for v, _ in positions(seed, LATEGAME_MOVES)]
+    blocks = Block.all_blocks()
+    legal, cleared = batch.evaluate(grids, blocks)
+    grid, block = grids[0], blocks[-1]
+    for y in range(grid.size):
+        for x in range(grid.size):
+            assert cleared[0, -1, y, x] == get_num_cleared(grid, block, (y, x))
+            assert legal[0, -1, y, x] == grid.can_place(block, (y, x))
+
+    boards = batch.stack(grids)
+    bench(lambda: batch.evaluate(boards, blocks))
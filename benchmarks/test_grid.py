@@ -0,0 +1,52 @@
+import pytest
+
+from block import Block
+from grid import Grid
+from bitgrid import BitGrid
+
+from corpus import SEEDS, LATEGAME_MOVES, positions
+
+
+GRID_TYPES = {"list": Grid, "bitboard": BitGrid}
+
+
+@pytest.mark.parametrize("grid_type", GRID_TYPES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_can_place(bench, grid_type: str, seed: int) -> None:
+    grids = [
+        GRID_TYPES[grid_type](values=v) for v, _ in positions(seed, LATEGAME_MOVES)
+    ]
+    blocks = Block.all_blocks()
+    cells = [(y, x) for y in range(grids[0].size) for x in range(grids[0].size)]
+
+    def run() -> None:
+        for grid in grids:
+            for block in blocks:
+                for position in cells:
+                    grid.can_place(block, position)
+
+    bench(run)
+
+
+@pytest.mark.parametrize("grid_type", GRID_TYPES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_clear_full(bench, grid_type: str, seed: int) -> None:
+    grids = []
+    for values, hand in positions(seed, LATEGAME_MOVES):
+        grid = GRID_TYPES[grid_type](values=values)
+        for block in hand:
+            for position in grid.legal_positions(block):
+                if grid.count_cleared(block, position):
+                    placed = grid.copy()
+                    placed.place(block, position)
+                    grids.append(placed)
+    assert grids
+
+    def setup() -> tuple:
+        return ([grid.copy() for grid in grids],)
+
+    def run(copies: list) -> None:
+        for grid in copies:
+            grid.clear_full()
+
+    bench(run, setup)
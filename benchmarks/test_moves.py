@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from config import DEFAULT_GRID_SIZE
+from block import Block
+from selection import Selection
+from grid import Grid
+from bitgrid import BitGrid
+from solver import solve
+
+from corpus import SEEDS
+
+
+GRID_TYPES = {"list": Grid, "bitboard": BitGrid}
+GAMES = 20
+
+
+def snapshot(grid: Grid) -> tuple:
+    """Capture the cells, line counts, hashes and touched cells of a grid."""
+    return (
+        [row[:] for row in grid.values],
+        list(grid.row_counts),
+        list(grid.col_counts),
+        grid.occupancy(),
+        grid.zobrist,
+        grid.touched,
+    )
+
+
+def assert_matches_fresh(grid: Grid) -> None:
+    """Check the incremental state of a grid against one built from its cells."""
+    fresh = Grid(values=[row[:] for row in grid.values])
+    assert grid.row_counts == fresh.row_counts
+    assert grid.col_counts == fresh.col_counts
+    assert grid.occupancy() == fresh.occupancy()
+    assert grid.zobrist == fresh.zobrist
+
+
+@pytest.mark.parametrize("grid_type", GRID_TYPES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_play_undo_round_trip(grid_type: str, seed: int) -> None:
+    rng = random.Random(seed)
+    blocks = Block.all_blocks()
+    for _ in range(GAMES):
+        # Start from random cells, with full lines left in, as solve_batch allows.
+        density = rng.uniform(0.2, 0.7)
+        grid = GRID_TYPES[grid_type](
+            values=[
+                [int(rng.random() < density) for _ in range(DEFAULT_GRID_SIZE)]
+                for _ in range(DEFAULT_GRID_SIZE)
+            ]
+        )
+        history = []
+        for _ in range(40):
+            block = rng.choice(blocks)
+            positions = grid.legal_positions(block)
+            if not positions or (history and rng.random() < 0.3):
+                if not history:
+                    break
+                move, before = history.pop()
+                grid.undo(move)
+                assert snapshot(grid) == before
+                continue
+
+            position = rng.choice(positions)
+            reference = Grid(values=[row[:] for row in grid.values])
+            expected = reference.play(block, position)
+            before = snapshot(grid)
+            move = grid.play(block, position)
+            assert (move.rows, move.cols) == (expected.rows, expected.cols)
+            assert grid.values == reference.values
+            assert_matches_fresh(grid)
+            history.append((move, before))
+
+        while history:
+            move, before = history.pop()
+            grid.undo(move)
+            assert snapshot(grid) == before
+        assert_matches_fresh(grid)
+
+
+@pytest.mark.parametrize("grid_type", GRID_TYPES)
+def test_solve_clears_full_lines_after_undo(grid_type: str) -> None:
+    values = [
+        [1, 1, 1, 1, 1],
+        [0, 1, 1, 1, 1],
+        [1, 1, 0, 1, 1],
+        [0, 0, 0, 1, 1],
+        [0, 1, 0, 1, 0],
+    ]
+    grid = GRID_TYPES[grid_type](values=values)
+    hand = [Block([[1]]), Block([[1, 1, 1], [1, 1, 1], [1, 1, 1]])]
+    assert solve(grid, Selection(hand, grid.size, len(hand))) is not None
@@ -0,0 +1,53 @@
+import pytest
+
+from selection import Selection
+from grid import Grid
+from bitgrid import BitGrid
+from solver import solve
+from transposition import TranspositionTable
+
+from corpus import SEEDS, MIDGAME_MOVES, LATEGAME_MOVES, Position, positions, hands
+
+
+GRID_TYPES = {"list": Grid, "bitboard": BitGrid}
+
+
+def solve_all(grid_type: type, corpus: tuple[Position, ...]) -> int:
+    """Solve every position of a corpus on fresh grids and count the solutions."""
+    solved = 0
+    cache = TranspositionTable()
+    for values, hand in corpus:
+        grid = grid_type(values=[row[:] for row in values])
+        if solve(grid, Selection([b.copy() for b in hand]), cache) is not None:
+            solved += 1
+    return solved
+
+
+@pytest.mark.parametrize("grid_type", GRID_TYPES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_solve_midgame(bench, grid_type: str, seed: int) -> None:
+    corpus = positions(seed, MIDGAME_MOVES)
+    bench(lambda: solve_all(GRID_TYPES[grid_type], corpus))
+
+
+@pytest.mark.parametrize("grid_type", GRID_TYPES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_solve_lategame(bench, grid_type: str, seed: int) -> None:
+    corpus = positions(seed, LATEGAME_MOVES)
+    bench(lambda: solve_all(GRID_TYPES[grid_type], corpus))
+
+
+@pytest.mark.parametrize("grid_type", GRID_TYPES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_solve_solvable(bench, grid_type: str, seed: int) -> None:
+    corpus = hands(seed, solvable=True)
+    assert solve_all(GRID_TYPES[grid_type], corpus) == len(corpus)
+    bench(lambda: solve_all(GRID_TYPES[grid_type], corpus))
+
+
+@pytest.mark.parametrize("grid_type", GRID_TYPES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_solve_unsolvable(bench, grid_type: str, seed: int) -> None:
+    corpus = hands(seed, solvable=False)
+    assert solve_all(GRID_TYPES[grid_type], corpus) == 0
+    bench(lambda: solve_all(GRID_TYPES[grid_type], corpus))
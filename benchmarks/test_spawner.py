@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from grid import Grid
+from spawner import Spawner
+
+from corpus import SEEDS, LATEGAME_MOVES, positions, dense_grids
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_spawn_lategame(bench, seed: int) -> None:
+    grids = [Grid(values=v) for v, _ in positions(seed, LATEGAME_MOVES)]
+
+    def run() -> None:
+        spawner = Spawner(rng=random.Random(seed))
+        for grid in grids:
+            spawner.spawn(grid)
+
+    bench(run)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_spawn_worst_case(bench, seed: int) -> None:
+    grids = [Grid(values=values) for values in dense_grids(seed)]
+
+    def run() -> None:
+        spawner = Spawner(fallback="exhaustive", rng=random.Random(seed))
+        for grid in grids:
+            spawner.spawn(grid)
+
+    bench(run)
@@ -0,0 +1,135 @@
+import time
+from typing import Callable, Optional
+
+from block import Block
+from selection import Selection
+from grid import Grid
+from pruning import Pruner, empty_regions
+from solver import SolverInterrupted, SolverStats, solve
+from transposition import TranspositionTable
+
+
+def evaluate(grid: Grid) -> int:
+    """Score a board by its empty cells, penalising fragmented empty space."""
+    empty = ((1 << (grid.size * grid.size)) - 1) & ~grid.occupancy()
+    return empty.bit_count() - 2 * len(empty_regions(empty, grid.size))
+
+
+class AnytimeSolver:
+    def __init__(
+        self,
+        deadline: float = 50,
+        max_width: int = 64,
+        pruner: Optional[Pruner] = None,
+    ) -> None:
+        """Initialize a solver that improves its placement until a deadline in ms."""
+        self.deadline: float = deadline
+        self.max_width: int = max_width
+        self.pruner: Optional[Pruner] = pruner
+        self.widths: list[int] = []
+
+    def solve(
+        self,
+        grid: Grid,
+        selection: Selection,
+        cache: TranspositionTable | None = None,
+        stop: Optional[Callable[[], bool]] = None,
+        stats: Optional[SolverStats] = None,
+    ) -> list[tuple[Block, tuple[int, int]]] | None:
+        """Find the best scoring placement of every block before the deadline.
+
+        Stats cover the search for a first solution and the states and children
+        of every beam.
+        """
+        deadline = time.perf_counter() + self.deadline / 1000
+        blocks = list(selection.blocks)
+        best = solve(grid.copy(), Selection(blocks[:]), cache, stop, self.pruner, stats)
+        if best is None:
+            return None
+        best_value = self.value(grid, best)
+
+        start = time.perf_counter()
+        self.widths = []
+        width = 1
+        try:
+            while time.perf_counter() < deadline:
+                found, exhaustive = self.beam(
+                    grid, blocks, width, deadline, stop, stats
+                )
+                self.widths.append(width)
+                if found is not None and found[0] > best_value:
+                    best_value, best = found
+                if exhaustive or width >= self.max_width:
+                    break
+                width *= 2
+        finally:
+            if stats is not None:
+                stats.elapsed += time.perf_counter() - start
+
+        for block, position in best:
+            grid.play(block, position)
+        return best
+
+    def beam(
+        self,
+        grid: Grid,
+        blocks: list[Block],
+        width: int,
+        deadline: float,
+        stop: Optional[Callable[[], bool]] = None,
+        stats: Optional[SolverStats] = None,
+    ) -> tuple[tuple[int, list[tuple[Block, tuple[int, int]]]] | None, bool]:
+        """Keep the best states per depth and report if the search was exhaustive."""
+        states: list[tuple[int, int, Grid, list[Block], list]] = [
+            (0, 0, grid.copy(), blocks, [])
+        ]
+        exhaustive = True
+        for depth in range(len(blocks)):
+            start = time.perf_counter()
+            children = []
+            for _, points, state, remaining, placements in states:
+                if stats is not None:
+                    stats.nodes += 1
+                    if stats.on_node is not None:
+                        stats.on_node(depth, state, remaining)
+                seen = set()
+                for idx, block in enumerate(remaining):
+                    if block.shape in seen:
+                        continue
+                    seen.add(block.shape)
+                    for position in state.legal_positions(block):
+                        if stop is not None and stop():
+                            raise SolverInterrupted()
+                        if time.perf_counter() > deadline:
+                            return None, False
+                        if stats is not None:
+                            stats.placements += 1
+                        child = state.copy()
+                        gained = block.tile_count + child.play(block, position).lines
+                        children.append(
+                            (
+                                points + gained + evaluate(child),
+                                points + gained,
+                                child,
+                                remaining[:idx] + remaining[idx + 1 :],
+                                placements + [(block, position)],
+                            )
+                        )
+            if stats is not None:
+                stats.add_depth_time(depth, time.perf_counter() - start)
+            if not children:
+                return None, exhaustive
+            children.sort(key=lambda c: c[0], reverse=True)
+            if len(children) > width:
+                exhaustive = False
+            states = children[:width]
+        value, _, _, _, placements = states[0]
+        return (value, placements), exhaustive
+
+    def value(self, grid: Grid, placements: list[tuple[Block, tuple[int, int]]]) -> int:
+        """Score a placement by the points it earns and the board it leaves."""
+        grid = grid.copy()
+        points = 0
+        for block, position in placements:
+            points += block.tile_count + grid.play(block, position).lines
+        return points + evaluate(grid)
@@ -0,0 +1,82 @@
+import numpy as np
+from typing import Optional
+
+from block import Block
+from grid import Grid
+
+
+def stack(grids: list[Grid]) -> np.ndarray:
+    """Stack grids of the same size into a boolean array of shape (boards, y, x)."""
+    return np.array([grid.values for grid in grids], dtype=bool)
+
+
+def legal_moves(boards: np.ndarray, blocks: Optional[list[Block]] = None) -> np.ndarray:
+    """Get the legality of every (board, block, y, x) placement in one pass.
+
+    Each block slides over all boards at once: the cells under each of its tiles
+    are gathered as shifted windows and a placement is legal when none is filled.
+    Offsets where the block would leave the board are illegal.
+    """
+    if blocks is None:
+        blocks = Block.all_blocks()
+    count, size, _ = boards.shape
+    legal = np.zeros((count, len(blocks), size, size), dtype=bool)
+    for p, block in enumerate(blocks):
+        h = size - block.height + 1
+        w = size - block.width + 1
+        if h <= 0 or w <= 0:
+            continue
+        blocked = np.zeros((count, h, w), dtype=bool)
+        for i, j in block.shape.cells:
+            blocked |= boards[:, i : i + h, j : j + w]
+        legal[:, p, :h, :w] = ~blocked
+    return legal
+
+
+def clear_counts(
+    boards: np.ndarray,
+    blocks: Optional[list[Block]] = None,
+    legal: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Get the lines every (board, block, y, x) placement clears, or -1 if illegal.
+
+    A row is completed when its filled count plus the tiles the block adds to it
+    reach the board size, and likewise for columns, so the clears of a placement
+    are the full rows at its y offset plus the full columns at its x offset.
+    """
+    if blocks is None:
+        blocks = Block.all_blocks()
+    if legal is None:
+        legal = legal_moves(boards, blocks)
+    count, size, _ = boards.shape
+    row_counts = boards.sum(axis=2)
+    col_counts = boards.sum(axis=1)
+    cleared = np.full((count, len(blocks), size, size), -1, dtype=np.int8)
+    for p, block in enumerate(blocks):
+        h = size - block.height + 1
+        w = size - block.width + 1
+        if h <= 0 or w <= 0:
+            continue
+        rows = np.zeros((count, h), dtype=np.int8)
+        for i, tiles in enumerate(block.shape.row_tiles):
+            if tiles:
+                rows += row_counts[:, i : i + h] + tiles == size
+        cols = np.zeros((count, w), dtype=np.int8)
+        for j, tiles in enumerate(block.shape.col_tiles):
+            if tiles:
+                cols += col_counts[:, j : j + w] + tiles == size
+        cleared[:, p, :h, :w] = np.where(
+            legal[:, p, :h, :w], rows[:, :, None] + cols[:, None, :], -1
+        )
+    return cleared
+
+
+def evaluate(
+    grids: list[Grid] | np.ndarray, blocks: Optional[list[Block]] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get the legality masks and clear counts of every block on every board."""
+    boards = grids if isinstance(grids, np.ndarray) else stack(grids)
+    if blocks is None:
+        blocks = Block.all_blocks()
+    legal = legal_moves(boards, blocks)
+    return legal, clear_counts(boards, blocks, legal)
@@ -0,0 +1,206 @@
+import argparse
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from block import Block
+from selection import Selection
+from grid import Grid
+from bitgrid import BitGrid
+from pruning import Pruner
+from solver import SolverInterrupted, solve
+from transposition import TranspositionTable
+
+
+GRID_TYPES = {"list": Grid, "bitboard": BitGrid}
+IMPORT_MODULES = ["grid", "solver", "game", "render"]
+
+
+def random_position(
+    rng: random.Random, moves: int = 12, size: int = 8, hand_size: int = 3
+) -> tuple[list[list], list[Block]]:
+    """Generate a mid-game grid by playing random placements, and a hand."""
+    grid = Grid(size)
+    blocks = Block.all_blocks()
+    for _ in range(moves):
+        block = rng.choice(blocks)
+        positions = [
+            (y, x)
+            for y in range(grid.size - block.height + 1)
+            for x in range(grid.size - block.width + 1)
+            if grid.can_place(block, (y, x))
+        ]
+        if positions:
+            grid.place(block, rng.choice(positions))
+            grid.clear_full()
+    return grid.values, [rng.choice(blocks) for _ in range(hand_size)]
+
+
+def bench_solve(
+    grid_type: type,
+    positions: list[tuple[list[list], list[Block]]],
+    cache: TranspositionTable | None = None,
+    pruner: Pruner | None = None,
+) -> tuple[float, int]:
+    """Solve every position with a grid type and return the time and solved count."""
+    solved = 0
+    start = time.perf_counter()
+    for values, hand in positions:
+        grid = grid_type(values=[row[:] for row in values])
+        if solve(grid, Selection([b.copy() for b in hand]), cache, pruner=pruner):
+            solved += 1
+    return time.perf_counter() - start, solved
+
+
+def bench_scaling(
+    grid_type: type,
+    positions: list[tuple[list[list], list[Block]]],
+    timeout: float,
+) -> tuple[float, float, int, int]:
+    """Solve positions with a time cap each and return the median and peak memory.
+
+    Returns the median solve time, the peak traced memory in bytes, and the
+    number of solved and timed out positions.
+    """
+    times = []
+    solved = timeouts = 0
+    tracemalloc.start()
+    for values, hand in positions:
+        grid = grid_type(values=[row[:] for row in values])
+        start = time.perf_counter()
+        deadline = start + timeout
+        try:
+            if solve(
+                grid,
+                Selection([b.copy() for b in hand], grid.size, len(hand)),
+                TranspositionTable(),
+                lambda: time.perf_counter() > deadline,
+            ):
+                solved += 1
+        except SolverInterrupted:
+            timeouts += 1
+        times.append(time.perf_counter() - start)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return sorted(times)[len(times) // 2], peak, solved, timeouts
+
+
+def scaling_matrix(
+    sizes: list[int], hands: list[int], count: int, seed: int, timeout: float
+) -> None:
+    """Report solve time and memory per engine as board and hand size grow."""
+    print(
+        f"{'engine':>10} {'size':>5} {'hand':>5} {'median ms':>10} "
+        f"{'peak KiB':>9} {'solved':>7} {'timeouts':>9}"
+    )
+    for size in sizes:
+        for hand_size in hands:
+            rng = random.Random(seed)
+            positions = [
+                random_position(rng, size * size // 5, size, hand_size)
+                for _ in range(count)
+            ]
+            for name, grid_type in GRID_TYPES.items():
+                median, peak, solved, timeouts = bench_scaling(
+                    grid_type, positions, timeout
+                )
+                print(
+                    f"{name:>10} {size:>5} {hand_size:>5} {median * 1000:>10.2f} "
+                    f"{peak / 1024:>9.0f} {solved:>7} {timeouts:>9}"
+                )
+
+
+def import_time(module: str, runs: int = 5) -> float | None:
+    """Measure the best cold import time of a module in a fresh interpreter."""
+    best: float | None = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", f"import {module}"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+        )
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_imports() -> None:
+    """Report cold import times relative to a bare interpreter start."""
+    startup = import_time("sys")
+    if startup is None:
+        print(f"{'startup':>10}: interpreter failed to start")
+        return
+    print(f"{'startup':>10}: {startup * 1000:8.1f} ms")
+    for module in IMPORT_MODULES:
+        elapsed = import_time(module)
+        if elapsed is None:
+            print(f"{module:>10}: import failed")
+        else:
+            print(f"{module:>10}: {(elapsed - startup) * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark solve throughput.")
+    parser.add_argument("-n", "--positions", type=int, default=50)
+    parser.add_argument("-m", "--moves", type=int, default=12)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument(
+        "-c", "--cache", action="store_true", help="share a transposition table"
+    )
+    parser.add_argument(
+        "--symmetric",
+        action="store_true",
+        help="key the transposition table by board symmetry",
+    )
+    parser.add_argument(
+        "-p", "--prune", action="store_true", help="enable the pruning rules"
+    )
+    parser.add_argument(
+        "--scaling",
+        action="store_true",
+        help="report solve time and memory across board and hand sizes instead",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 10, 16, 24, 32])
+    parser.add_argument("--hands", type=int, nargs="+", default=[3, 4, 5, 6])
+    parser.add_argument(
+        "--timeout", type=float, default=2.0, help="seconds allowed per scaling solve"
+    )
+    parser.add_argument(
+        "--imports", action="store_true", help="measure cold import times instead"
+    )
+    args = parser.parse_args()
+
+    if args.imports:
+        bench_imports()
+        return
+    if args.scaling:
+        scaling_matrix(args.sizes, args.hands, args.positions, args.seed, args.timeout)
+        return
+
+    rng = random.Random(args.seed)
+    positions = [random_position(rng, args.moves) for _ in range(args.positions)]
+    for block in Block.all_blocks():
+        block.placements(Grid().size)
+
+    for name, grid_type in GRID_TYPES.items():
+        cache = TranspositionTable(symmetric=args.symmetric) if args.cache else None
+        pruner = Pruner() if args.prune else None
+        elapsed, solved = bench_solve(grid_type, positions, cache, pruner)
+        print(
+            f"{name:>10}: {len(positions) / elapsed:8.2f} solves/s "
+            f"({elapsed:.3f}s, {solved}/{len(positions)} solvable)"
+            + (f" {cache}" if cache is not None else "")
+        )
+        if pruner is not None:
+            for rule, counts in pruner.stats().items():
+                print(f"{rule:>22}: {counts['cuts']} cuts / {counts['checks']} checks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+from typing import Callable, Optional
+
+from config import DEFAULT_GRID_SIZE
+from block import Block
+from grid import Grid, Move, line_masks
+from transposition import mask_hash, zobrist_hash
+
+
+class BitGrid(Grid):
+    def __init__(
+        self,
+        size: int = DEFAULT_GRID_SIZE,
+        values: Optional[list[list]] = None,
+        bits: int = 0,
+        zobrist: Optional[int] = None,
+    ) -> None:
+        """Initialize the grid as a bitmask with one bit per cell."""
+        if values:
+            size = len(values)
+        self.size: int = size
+        self.bits: int = bits
+        self.zobrist: int = zobrist_hash(bits, size) if zobrist is None else zobrist
+        self.row_masks, self.col_masks = line_masks(size)
+        self.full: int = (1 << (size * size)) - 1
+        # Cells filled since the last clear, or None to check all.
+        self.touched: Optional[int] = None
+        self.on_can_place: Optional[Callable[[], None]] = None
+        if values:
+            self.values = values
+
+    @property
+    def values(self) -> list[list]:
+        """Unpack the bitmask into new rows of cells, so set `values` to change them."""
+        return [
+            [(self.bits >> (y * self.size + x)) & 1 for x in range(self.size)]
+            for y in range(self.size)
+        ]
+
+    @values.setter
+    def values(self, values: list[list]) -> None:
+        """Pack rows of cells into the bitmask, replacing every cell."""
+        if len(values) != self.size:
+            raise ValueError("Values must match the grid size.")
+        self.bits = sum(
+            1 << (y * self.size + x)
+            for y, row in enumerate(values)
+            for x, value in enumerate(row)
+            if value == 1
+        )
+        self.zobrist = zobrist_hash(self.bits, self.size)
+        self.touched = None
+
+    @property
+    def row_counts(self) -> list[int]:
+        """Count the filled cells of every row."""
+        return [(self.bits & mask).bit_count() for mask in self.row_masks]
+
+    @row_counts.setter
+    def row_counts(self, counts: list[int]) -> None:
+        raise AttributeError("BitGrid counts the cells of its lines from its bits.")
+
+    @property
+    def col_counts(self) -> list[int]:
+        """Count the filled cells of every column."""
+        return [(self.bits & mask).bit_count() for mask in self.col_masks]
+
+    @col_counts.setter
+    def col_counts(self, counts: list[int]) -> None:
+        raise AttributeError("BitGrid counts the cells of its lines from its bits.")
+
+    def block_mask(self, block: Block, position: tuple[int, int]) -> int:
+        """Get the bitmask of a block placed at a position."""
+        return block.placements(self.size)[position]
+
+    def occupancy(self) -> int:
+        """Pack the filled cells into a bitmask with one bit per cell."""
+        return self.bits
+
+    def has_collision(self, block: Block, position: tuple[int, int]) -> bool:
+        """Check if a block collides with existing blocks at a position."""
+        return bool(self.bits & self.block_mask(block, position))
+
+    def _fill(self, block: Block, position: tuple[int, int]) -> None:
+        """Fill the cells of a block without checking if it fits."""
+        mask = self.block_mask(block, position)
+        self.bits |= mask
+        self.zobrist ^= mask_hash(mask, self.size)
+        if self.touched is not None:
+            self.touched |= mask
+
+    def count_cleared(self, block: Block, position: tuple[int, int]) -> int:
+        """Count the lines that placing a block at a position would clear."""
+        mask = self.block_mask(block, position)
+        bits = self.bits | mask
+        return sum(
+            1
+            for line in self.row_masks + self.col_masks
+            if line & mask and bits & line == line
+        )
+
+    def _clear(self) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """Clear full lines touched since the last clear and return them."""
+        bits = self.bits
+        touched = self.full if self.touched is None else self.touched
+        self.touched = 0
+        rows = tuple(
+            y
+            for y, mask in enumerate(self.row_masks)
+            if mask & touched and bits & mask == mask
+        )
+        cols = tuple(
+            x
+            for x, mask in enumerate(self.col_masks)
+            if mask & touched and bits & mask == mask
+        )
+        if rows or cols:
+            cleared = self.lines_mask(rows, cols)
+            self.bits = bits & ~cleared
+            self.zobrist ^= mask_hash(cleared, self.size)
+        return rows, cols
+
+    def lines_mask(self, rows: tuple[int, ...], cols: tuple[int, ...]) -> int:
+        """Get the bitmask covering the given rows and columns."""
+        mask = 0
+        for y in rows:
+            mask |= self.row_masks[y]
+        for x in cols:
+            mask |= self.col_masks[x]
+        return mask
+
+    def undo(self, move: Move) -> None:
+        """Revert a move by refilling its cleared lines and removing its block."""
+        cleared = self.lines_mask(move.rows, move.cols)
+        self.bits = (self.bits | cleared) & ~self.block_mask(move.block, move.position)
+        self.zobrist = move.zobrist
+        self.touched = move.touched
+
+    def restore(self, other: Grid) -> None:
+        """Restore the cells of the grid from another grid."""
+        self.bits = other.occupancy()
+        self.zobrist = other.zobrist
+        self.touched = other.touched
+
+    def copy(self):
+        """Make a copy of the current grid."""
+        return BitGrid(size=self.size, bits=self.bits, zobrist=self.zobrist)
+
+    @classmethod
+    def from_state(cls, state: tuple[int, int]) -> "BitGrid":
+        """Rebuild a grid from its compact state."""
+        size, bits = state
+        return cls(size=size, bits=bits)
@@ -1,8 +1,5 @@
-import pygame
 from random import choice
-from typing import List, Tuple, Optional
-
-from config import GRID_SIZE, TILE_SIZE, COLOR_PALETTE
+from typing import ClassVar, List, Sequence, Tuple
 
 
 BLOCKS = {
@@ -67,14 +64,131 @@ BLOCKS = {
 }
 
 
+class Shape:
+    __slots__ = (
+        "key",
+        "id",
+        "width",
+        "height",
+        "tile_count",
+        "cells",
+        "row_tiles",
+        "col_tiles",
+        "_placements",
+    )
+
+    key: tuple[tuple[int, ...], ...]
+    id: int
+    width: int
+    height: int
+    tile_count: int
+    cells: tuple[tuple[int, int], ...]
+    row_tiles: tuple[int, ...]
+    col_tiles: tuple[int, ...]
+    _placements: dict[int, dict[tuple[int, int], int]]
+
+    _interned: ClassVar[dict[tuple, "Shape"]] = {}
+    _catalogue_cache: ClassVar[dict["Shape", int]]
+
+    def __new__(cls, rows: Sequence[Sequence[int]]) -> "Shape":
+        """Get the unique interned shape for the given rows of cells."""
+        key = tuple(tuple(row) for row in rows)
+        shape = cls._interned.get(key)
+        if shape is not None:
+            return shape
+        if not key or not key[0]:
+            raise ValueError("Block shape must have at least one row and column.")
+
+        shape = super().__new__(cls)
+        width, height = len(key[0]), len(key)
+        cells = tuple(
+            (i, j) for i in range(height) for j in range(width) if key[i][j] == 1
+        )
+        for name, value in (
+            ("key", key),
+            ("id", len(cls._interned)),
+            ("width", width),
+            ("height", height),
+            ("tile_count", len(cells)),
+            ("cells", cells),
+            ("row_tiles", tuple(sum(row) for row in key)),
+            ("col_tiles", tuple(sum(col) for col in zip(*key))),
+            ("_placements", {}),
+        ):
+            object.__setattr__(shape, name, value)
+        cls._interned[key] = shape
+        return shape
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("Shape is immutable.")
+
+    def __reduce__(self):
+        return Shape, (self.key,)
+
+    def __getitem__(self, row: int) -> tuple:
+        return self.key[row]
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self):
+        return iter(self.key)
+
+    def placements(self, size: int) -> dict[tuple[int, int], int]:
+        """Map every in-bounds position of the shape to its cell bitmask."""
+        table = self._placements.get(size)
+        if table is None:
+            mask = 0
+            for i, j in self.cells:
+                mask |= 1 << (i * size + j)
+            table = {
+                (y, x): mask << (y * size + x)
+                for y in range(size - self.height + 1)
+                for x in range(size - self.width + 1)
+            }
+            self._placements[size] = table
+        return table
+
+    def rotate(self, deg: int = 0) -> "Shape":
+        """Get the shape rotated by the given degree."""
+        rows, m, n = self.key, self.height, self.width
+        if deg == 90:
+            return Shape([[rows[m - j - 1][i] for j in range(m)] for i in range(n)])
+        elif deg == 180:
+            return Shape([row[::-1] for row in rows][::-1])
+        elif deg == 270:
+            return Shape([[rows[j][i] for j in range(m)] for i in range(n)])
+        return self
+
+    @classmethod
+    def catalogue(cls) -> dict["Shape", int]:
+        """Map each distinct shape of all blocks to how many rotations produce it."""
+        if not hasattr(cls, "_catalogue_cache"):
+            catalogue: dict[Shape, int] = {}
+            for block in Block.all_blocks():
+                catalogue[block.shape] = catalogue.get(block.shape, 0) + 1
+            cls._catalogue_cache = catalogue
+        return cls._catalogue_cache
+
+    def __repr__(self):
+        return "\n".join(" ".join(f"{'■' if c else ' '}" for c in r) for r in self.key)
+
+    def __str__(self):
+        return self.__repr__()
+
+
 class Block:
-    def __init__(self, shape: List[list] | str, rotation: int = 0) -> None:
+    __slots__ = ("shape", "_position")
+
+    def __init__(self, shape: List[list] | str | Shape, rotation: int = 0) -> None:
         """Initialize a block with a given shape and rotation."""
-        if isinstance(shape, list):
-            self.shape: List[list] = shape
+        if isinstance(shape, Shape):
+            self.shape: Shape = shape
+        elif isinstance(shape, list):
+            self.shape = Shape(shape)
         elif isinstance(shape, str):
             if shape in BLOCKS:
-                self.shape = BLOCKS[shape]
+                self.shape = Shape(BLOCKS[shape])
             else:
                 raise ValueError(
                     f"Block name '{shape}' not found in predefined blocks."
@@ -87,9 +201,21 @@ class Block:
         self.rotate(rotation)
 
         self._position: Tuple[int, int] = (0, 0)
-        self.width: int = len(self.shape[0])
-        self.height: int = len(self.shape)
-        self.tile_count: int = sum(row.count(1) for row in self.shape)
+
+    @property
+    def width(self) -> int:
+        """Get the number of columns of the block."""
+        return self.shape.width
+
+    @property
+    def height(self) -> int:
+        """Get the number of rows of the block."""
+        return self.shape.height
+
+    @property
+    def tile_count(self) -> int:
+        """Get the number of tiles of the block."""
+        return self.shape.tile_count
 
     @property
     def position(self) -> Tuple[int, int]:
@@ -98,17 +224,16 @@ class Block:
 
     @position.setter
     def position(self, value: Tuple[int, int]) -> None:
-        """Set the position of the block and adjust if out of bounds."""
+        """Set the position of the block."""
         self._position = value
-        self.adjust_position()
 
-    def adjust_position(self) -> None:
+    def adjust_position(self, size: int) -> None:
         """Adjust the block's position to ensure it stays within grid bounds."""
         y, x = self._position
-        if y + self.height > GRID_SIZE:
-            y -= (y + self.height) - GRID_SIZE
-        if x + self.width > GRID_SIZE:
-            x -= (x + self.width) - GRID_SIZE
+        if y + self.height > size:
+            y -= (y + self.height) - size
+        if x + self.width > size:
+            x -= (x + self.width) - size
         self._position = (max(y, 0), max(x, 0))
 
     @classmethod
@@ -123,50 +248,33 @@ class Block:
     @classmethod
     def random(cls, exclude: list = []) -> "Block":
         """Generate a random block with a random rotation."""
-        return choice([b for b in cls.all_blocks() if b not in exclude])
+        excluded = {b.shape for b in exclude}
+        return choice([b for b in cls.all_blocks() if b.shape not in excluded])
+
+    @property
+    def key(self) -> tuple:
+        """Get a hashable key of the block's shape."""
+        return self.shape.key
+
+    @classmethod
+    def from_key(cls, key: tuple) -> "Block":
+        """Rebuild a block from its shape key."""
+        return cls(Shape(key))
+
+    def placements(self, size: int) -> dict[tuple[int, int], int]:
+        """Map every in-bounds position of the block to its cell bitmask."""
+        return self.shape.placements(size)
 
     def rotate(self, deg: int = 0) -> None:
         """Rotate the block by the given degree."""
-        m, n = len(self.shape), len(self.shape[0])
-        if deg == 90:
-            self.shape = [
-                [self.shape[m - j - 1][i] for j in range(m)] for i in range(n)
-            ]
-        elif deg == 180:
-            self.shape = [row[::-1] for row in self.shape][::-1]
-        elif deg == 270:
-            self.shape = [[self.shape[j][i] for j in range(m)] for i in range(n)]
-        self.width = len(self.shape[0])
-        self.height = len(self.shape)
+        self.shape = self.shape.rotate(deg)
 
     def copy(self):
         """Make a copy of the current block."""
-        return Block(shape=[row[:] for row in self.shape])
-
-    def render(
-        self,
-        screen: pygame.Surface,
-        fill_color: Tuple[int, int, int] = COLOR_PALETTE["tile"],
-        position: Optional[Tuple[int, int]] = None,
-        offset: Tuple[int, int] = (0, 0),
-        tile_size: int = TILE_SIZE,
-    ) -> None:
-        """Render the block on the screen at the specified position."""
-        if not position:
-            position = self.position
-        for row in range(self.height):
-            for col in range(self.width):
-                if self.shape[row][col] == 1:
-                    x = (position[1] + col) * tile_size + offset[0]
-                    y = (position[0] + row) * tile_size + offset[1]
-                    rect = pygame.Rect(x, y, tile_size, tile_size)
-                    pygame.draw.rect(screen, fill_color, rect)
-                    pygame.draw.rect(screen, COLOR_PALETTE["fore"], rect, 1)
+        return Block(shape=self.shape)
 
     def __repr__(self):
-        return "\n".join(
-            " ".join(f"{'■' if c else ' '}" for c in r) for r in self.shape
-        )
+        return repr(self.shape)
 
     def __str__(self):
         return self.__repr__()
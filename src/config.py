@@ -1,9 +1,8 @@
-GRID_SIZE = 8
-TILE_SIZE = 50
+DEFAULT_GRID_SIZE = 8
+DEFAULT_HAND_SIZE = 3
 
-SCREEN_WIDTH = round((GRID_SIZE * 1.5) * TILE_SIZE)
-SCREEN_HEIGHT = round((GRID_SIZE * 1.7) * TILE_SIZE)
-SCREEN_RECT = (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+TILE_SIZE = 50
+MAX_GRID_PIXELS = 800
 
 COLOR_PALETTE = {
     "back": (0, 0, 0),
@@ -13,5 +12,8 @@ COLOR_PALETTE = {
     "tile-error": (129, 11, 71),
 }
 
+FPS = 60
+
 FONT_NAME = "Arial"
 FONT_SIZE = 24
+OVERLAY_FONT_SIZE = 14
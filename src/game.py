@@ -0,0 +1,200 @@
+import json
+import random
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+from anytime import AnytimeSolver
+from config import DEFAULT_GRID_SIZE, DEFAULT_HAND_SIZE
+from block import Block
+from selection import Selection
+from grid import Grid
+from pruning import Pruner
+from solver import SolverStats, solve
+from spawner import Spawner
+from transposition import TranspositionTable
+
+if TYPE_CHECKING:
+    from lookahead import LookaheadPlanner
+    from parallel import ParallelSolver
+    from record import GameRecorder
+    from store import SolvabilityStore
+
+
+class Game:
+    def __init__(
+        self,
+        grid: Optional[Grid] = None,
+        selection: Optional[Selection] = None,
+        score: int = 0,
+        cache: Optional[TranspositionTable] = None,
+        spawner: Optional[Spawner] = None,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        pruner: Optional[Pruner] = None,
+        record_stats: bool = False,
+        deadline: Optional[float] = None,
+        store: Optional["SolvabilityStore"] = None,
+        grid_size: int = DEFAULT_GRID_SIZE,
+        hand_size: int = DEFAULT_HAND_SIZE,
+        recorder: Optional["GameRecorder"] = None,
+        lookahead: Optional["LookaheadPlanner"] = None,
+    ) -> None:
+        """Initialize the game state without any rendering."""
+        if grid is None:
+            grid = Grid(grid_size)
+        if cache is None:
+            cache = TranspositionTable()
+        parallel = None
+        if workers > 1:
+            from parallel import ParallelSolver
+
+            parallel = ParallelSolver(workers, pruning=pruner is not None)
+        if spawner is None:
+            spawner = Spawner(
+                hand_size=hand_size,
+                cache=cache,
+                rng=random.Random(seed),
+                solver=parallel,
+                store=store,
+            )
+        if selection is None:
+            selection = Selection(spawner.spawn(grid), grid.size, spawner.hand_size)
+
+        self.grid: Grid = grid
+        self.selection: Selection = selection
+        self.score: int = score
+        self.cache: TranspositionTable = cache
+        self.spawner: Spawner = spawner
+        self.parallel: Optional["ParallelSolver"] = parallel
+        self.pruner: Optional[Pruner] = pruner
+        self.store: Optional["SolvabilityStore"] = store
+        self.anytime: Optional[AnytimeSolver] = (
+            AnytimeSolver(deadline, pruner=pruner) if deadline is not None else None
+        )
+        self.lookahead: Optional["LookaheadPlanner"] = lookahead
+        self.moves: int = 0
+        self.hands: int = 0
+        self.solve_times: list[float] = []
+        self.record_stats: bool = record_stats
+        self.solve_stats: list[dict] = []
+        self.recorder: Optional["GameRecorder"] = recorder
+        if recorder is not None:
+            recorder.hand(self.selection.blocks)
+
+    def place_block(self) -> bool:
+        """Place the active block on the grid and update score."""
+        if self.selection.len() <= 0:
+            return False
+        block = self.selection.active
+        if not self.grid.place(block, block.position):
+            return False
+        lines = self.grid.clear_full()
+        self.score += block.tile_count + lines
+        self.moves += 1
+        if self.recorder is not None:
+            self.recorder.place(block, block.position, lines)
+        self.selection.pop()
+        if self.selection.len() <= 0:
+            self.spawn_blocks()
+        return True
+
+    def spawn_blocks(self) -> None:
+        """Spawns new blocks in selection."""
+        self.deal(self.spawner.spawn(self.grid))
+
+    def deal(self, blocks: list[Block]) -> None:
+        """Put a new hand of blocks in the selection."""
+        self.selection.spawn(blocks)
+        self.hands += 1
+        if self.recorder is not None:
+            self.recorder.hand(self.selection.blocks)
+
+    def play(self, block: Block, position: tuple[int, int]) -> None:
+        """Select the hand block matching a solver block and place it."""
+        idx = -1
+        for i, b in enumerate(self.selection.blocks):
+            if block.shape is b.shape:
+                idx = i
+        self.selection.select(idx, initial_position=position)
+        if not self.grid.can_place(
+            self.selection.active, self.selection.active.position
+        ):
+            raise ValueError(f"Block\n{block}\ncannot be placed at {position}")
+        self.place_block()
+
+    def solve(
+        self,
+        grid: Optional[Grid] = None,
+        selection: Optional[Selection] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> list[tuple[Block, tuple[int, int]]] | None:
+        """Solve a copy of the hand and record the solver latency."""
+        if grid is None:
+            grid = self.grid.copy()
+        if selection is None:
+            selection = self.selection.copy()
+        stats = SolverStats() if self.record_stats else None
+        start = time.perf_counter()
+        known = None
+        if self.store is not None:
+            blocks = list(selection.blocks)
+            board = grid.copy()
+            known = self.store.lookup(board, blocks)
+        if known is False:
+            solution = None
+        elif self.lookahead is not None:
+            solution = self.lookahead.solve(grid, selection, self.cache, stop, stats)
+        elif self.anytime is not None:
+            solution = self.anytime.solve(grid, selection, self.cache, stop, stats)
+        elif self.parallel is not None:
+            solution = self.parallel.solve(grid, selection, self.cache, stop, stats)
+        else:
+            solution = solve(grid, selection, self.cache, stop, self.pruner, stats)
+        elapsed = time.perf_counter() - start
+        self.solve_times.append(elapsed)
+        if self.store is not None and known is None:
+            self.store.record(board, blocks, solution is not None)
+        if stats is not None:
+            self.solve_stats.append(
+                {
+                    "hand": self.hands,
+                    "solved": solution is not None,
+                    "latency": elapsed,
+                    **stats.as_dict(),
+                }
+            )
+        return solution
+
+    def dump_stats(self, path: str) -> None:
+        """Write the recorded solver stats as one JSON object per line."""
+        with open(path, "w") as f:
+            for record in self.solve_stats:
+                f.write(json.dumps(record) + "\n")
+
+    def is_over(self) -> bool:
+        """Check if no block of the hand can be placed."""
+        return not self.grid.placeable(self.selection.blocks)
+
+    def step(self) -> bool:
+        """Solve and place the current hand, returning False if it has no solution."""
+        solution = self.solve()
+        if not solution:
+            return False
+        for block, position in solution:
+            self.play(block, position)
+        return True
+
+    def run(self, max_hands: Optional[int] = None) -> None:
+        """Auto-play hands until the game is over or the hand limit is reached."""
+        while max_hands is None or self.hands < max_hands:
+            if not self.step():
+                break
+
+    def close(self) -> None:
+        """Shut down the solver workers, close the store and flush the record."""
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.store is not None:
+            self.store.close()
+        if self.recorder is not None:
+            self.recorder.flush()
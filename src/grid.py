@@ -1,24 +1,66 @@
-import pygame
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional
 
-from config import GRID_SIZE, TILE_SIZE, COLOR_PALETTE
+from config import DEFAULT_GRID_SIZE
 from block import Block
+from transposition import mask_hash, zobrist_hash
+
+
+class Move(NamedTuple):
+    """Undo record of a placement and the lines it cleared."""
+
+    block: Block
+    position: tuple[int, int]
+    rows: tuple[int, ...]
+    cols: tuple[int, ...]
+    zobrist: int
+    touched: Optional[int]
+
+    @property
+    def lines(self) -> int:
+        """Get the number of lines cleared by the move."""
+        return len(self.rows) + len(self.cols)
+
+
+@lru_cache(maxsize=None)
+def line_masks(size: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Precompute the bitmasks of every row and column for a grid size."""
+    row = (1 << size) - 1
+    rows = tuple(row << (y * size) for y in range(size))
+    col = sum(1 << (y * size) for y in range(size))
+    cols = tuple(col << x for x in range(size))
+    return rows, cols
 
 
 class Grid:
     def __init__(
-        self, size: int = GRID_SIZE, values: Optional[list[list]] = None
+        self, size: int = DEFAULT_GRID_SIZE, values: Optional[list[list]] = None
     ) -> None:
         """Initialize the grid with a specified size."""
         self.values: list[list] = (
             [[0] * size for _ in range(size)] if not values else values
         )
         self.size: int = len(self.values)
+        # Filled cells as a bitmask, kept in step with the values.
+        self.bits: int = sum(
+            1 << (y * self.size + x)
+            for y, row in enumerate(self.values)
+            for x, value in enumerate(row)
+            if value == 1
+        )
+        self.zobrist: int = zobrist_hash(self.bits, self.size)
+        self.row_counts: list[int] = [sum(row) for row in self.values]
+        self.col_counts: list[int] = [sum(col) for col in zip(*self.values)]
+        # Cells filled since the last clear, or None to check all.
+        self.touched: Optional[int] = None
+        self.on_can_place: Optional[Callable[[], None]] = None
 
     def can_place(
         self, block: Block, position: Optional[tuple[int, int]] = None
     ) -> bool:
         """Check if a block can be placed at a given position on the grid."""
+        if self.on_can_place is not None:
+            self.on_can_place()
         if not block:
             return False
 
@@ -27,11 +69,30 @@ class Grid:
                 block, position
             )
 
-        for i in range(self.size - block.height + 1):
-            for j in range(self.size - block.width + 1):
-                if self.can_place(block, (i, j)):
-                    return True
-        return False
+        occupied = self.occupancy()
+        return any(not occupied & mask for mask in block.placements(self.size).values())
+
+    def legal_positions(self, block: Block) -> list[tuple[int, int]]:
+        """Get all positions where a block can be placed on the grid."""
+        occupied = self.occupancy()
+        return [
+            position
+            for position, mask in block.placements(self.size).items()
+            if not occupied & mask
+        ]
+
+    def placeable(self, blocks: list[Block]) -> list[Block]:
+        """Filter the blocks that can be placed anywhere on the grid."""
+        occupied = self.occupancy()
+        return [
+            block
+            for block in blocks
+            if any(not occupied & mask for mask in block.placements(self.size).values())
+        ]
+
+    def occupancy(self) -> int:
+        """Get the filled cells as a bitmask with one bit per cell."""
+        return self.bits
 
     def is_within_bounds(self, block: Block, position: tuple[int, int]) -> bool:
         """Check if a block is within the bounds of the grid."""
@@ -45,55 +106,145 @@ class Grid:
 
     def has_collision(self, block: Block, position: tuple[int, int]) -> bool:
         """Check if a block collides with existing blocks at a position."""
-        for i in range(block.height):
-            for j in range(block.width):
-                y, x = position[0] + i, position[1] + j
-                if block.shape[i][j] == 1 and self.values[y][x] == 1:
-                    return True
+        for i, j in block.shape.cells:
+            if self.values[position[0] + i][position[1] + j] == 1:
+                return True
         return False
 
     def place(self, block: Block, position: tuple[int, int]) -> bool:
         """Place a block on the grid at a given position."""
         if not self.can_place(block, position):
             return False
-        for i in range(block.height):
-            for j in range(block.width):
-                if block.shape[i][j] == 1:
-                    y, x = position[0] + i, position[1] + j
-                    self.values[y][x] = 1
+        self._fill(block, position)
         return True
 
-    def clear_full(self) -> int:
-        """Clear full rows and columns."""
+    def _fill(self, block: Block, position: tuple[int, int]) -> None:
+        """Fill the cells of a block without checking if it fits."""
+        for i, j in block.shape.cells:
+            y, x = position[0] + i, position[1] + j
+            self.values[y][x] = 1
+            self.row_counts[y] += 1
+            self.col_counts[x] += 1
+        mask = block.placements(self.size)[position]
+        self.bits |= mask
+        self.zobrist ^= mask_hash(mask, self.size)
+        if self.touched is not None:
+            self.touched |= mask
+
+    def count_cleared(self, block: Block, position: tuple[int, int]) -> int:
+        """Count the lines that placing a block at a position would clear."""
+        y, x = position
         count = 0
-        for y in range(self.size):
-            if all(self.values[y]):
-                self.values[y] = [0] * self.size
+        for i, tiles in enumerate(block.shape.row_tiles):
+            if self.row_counts[y + i] + tiles == self.size:
                 count += 1
-        for x in range(self.size):
-            if all(self.values[y][x] == 1 for y in range(self.size)):
-                for y in range(self.size):
-                    self.values[y][x] = 0
+        for j, tiles in enumerate(block.shape.col_tiles):
+            if self.col_counts[x + j] + tiles == self.size:
                 count += 1
         return count
 
+    def clear_full(self) -> int:
+        """Clear full rows and columns."""
+        rows, cols = self._clear()
+        return len(rows) + len(cols)
+
+    def _clear(self) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """Clear full lines touched since the last clear and return them."""
+        touched = self.touched
+        self.touched = 0
+        row_masks, col_masks = line_masks(self.size)
+        full_rows = tuple(
+            y
+            for y, mask in enumerate(row_masks)
+            if (touched is None or mask & touched) and self.row_counts[y] == self.size
+        )
+        full_cols = tuple(
+            x
+            for x, mask in enumerate(col_masks)
+            if (touched is None or mask & touched) and self.col_counts[x] == self.size
+        )
+        cleared = 0
+        for y in full_rows:
+            for x in range(self.size):
+                if self.values[y][x] == 1:
+                    self.values[y][x] = 0
+                    self.col_counts[x] -= 1
+            self.row_counts[y] = 0
+            cleared |= row_masks[y]
+        for x in full_cols:
+            for y in range(self.size):
+                if self.values[y][x] == 1:
+                    self.values[y][x] = 0
+                    self.row_counts[y] -= 1
+            self.col_counts[x] = 0
+            cleared |= col_masks[x]
+        if cleared:
+            self.bits &= ~cleared
+            self.zobrist ^= mask_hash(cleared, self.size)
+        return full_rows, full_cols
+
+    def play(self, block: Block, position: tuple[int, int]) -> Move:
+        """Place a legal block, clear full lines and return the undo record."""
+        zobrist, touched = self.zobrist, self.touched
+        self._fill(block, position)
+        rows, cols = self._clear()
+        return Move(block, position, rows, cols, zobrist, touched)
+
+    def undo(self, move: Move) -> None:
+        """Revert a move by refilling its cleared lines and removing its block."""
+        row_masks, col_masks = line_masks(self.size)
+        cleared = 0
+        for y in move.rows:
+            cleared |= row_masks[y]
+            for x in range(self.size):
+                if self.values[y][x] == 0:
+                    self.values[y][x] = 1
+                    self.row_counts[y] += 1
+                    self.col_counts[x] += 1
+        for x in move.cols:
+            cleared |= col_masks[x]
+            for y in range(self.size):
+                if self.values[y][x] == 0:
+                    self.values[y][x] = 1
+                    self.row_counts[y] += 1
+                    self.col_counts[x] += 1
+        for i, j in move.block.shape.cells:
+            y, x = move.position[0] + i, move.position[1] + j
+            self.values[y][x] = 0
+            self.row_counts[y] -= 1
+            self.col_counts[x] -= 1
+        mask = move.block.placements(self.size)[move.position]
+        self.bits = (self.bits | cleared) & ~mask
+        self.zobrist = move.zobrist
+        self.touched = move.touched
+
+    def restore(self, other: "Grid") -> None:
+        """Restore the cells of the grid from another grid."""
+        for y, row in enumerate(other.values):
+            self.values[y][:] = row
+        self.bits = other.bits
+        self.zobrist = other.zobrist
+        self.row_counts[:] = other.row_counts
+        self.col_counts[:] = other.col_counts
+        self.touched = other.touched
+
     def copy(self):
         """Make a copy of the current grid."""
         return Grid(values=[row[:] for row in self.values])
 
-    def render(self, screen: pygame.Surface, offset: tuple[int, int] = (0, 0)) -> None:
-        """Render the grid onto the screen."""
-        for y in range(self.size):
-            for x in range(self.size):
-                rect = pygame.Rect(
-                    x * TILE_SIZE + offset[0],
-                    y * TILE_SIZE + offset[1],
-                    TILE_SIZE,
-                    TILE_SIZE,
-                )
-                if self.values[y][x] == 1:
-                    pygame.draw.rect(screen, COLOR_PALETTE["tile"], rect)
-                pygame.draw.rect(screen, COLOR_PALETTE["fore"], rect, 1)
+    def state(self) -> tuple[int, int]:
+        """Get a compact picklable state of the grid as its size and bitmask."""
+        return self.size, self.occupancy()
+
+    @classmethod
+    def from_state(cls, state: tuple[int, int]) -> "Grid":
+        """Rebuild a grid from its compact state."""
+        size, bits = state
+        return cls(
+            values=[
+                [(bits >> (y * size + x)) & 1 for x in range(size)] for y in range(size)
+            ]
+        )
 
     def __repr__(self):
         return "\n".join(
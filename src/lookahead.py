@@ -0,0 +1,177 @@
+import random
+import time
+from typing import Callable, Optional
+
+from block import Block
+from selection import Selection
+from grid import Grid
+from anytime import evaluate
+from pruning import Pruner
+from solver import SolverInterrupted, SolverStats, iter_solutions
+from transposition import TranspositionTable
+
+
+class LookaheadPlanner:
+    def __init__(
+        self,
+        depth: int = 1,
+        samples: int = 8,
+        budget: float = 200,
+        candidates: int = 16,
+        branching: int = 4,
+        pruner: Optional[Pruner] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Initialize a planner that looks `depth` hands ahead within `budget` ms.
+
+        Candidate placements of the hand are scored by the chance that sampled
+        future hands can still be placed after them, taking the best of up to
+        `branching` placements of every sampled hand below the first level.
+        """
+        self.depth: int = depth
+        self.samples: int = samples
+        self.budget: float = budget
+        self.candidates: int = candidates
+        self.branching: int = branching
+        self.pruner: Optional[Pruner] = pruner
+        self.rng: random.Random = rng if rng is not None else random.Random()
+        self.evaluations: int = 0
+        self.memo_hits: int = 0
+        self.memo: dict[tuple[int, int], float] = {}
+
+    def sample(self, hand_size: int) -> list[list[Block]]:
+        """Draw future hands the way `Selection.spawn` deals them."""
+        return [
+            [b.copy() for b in self.rng.sample(Block.all_blocks(), hand_size)]
+            for _ in range(self.samples)
+        ]
+
+    def solve(
+        self,
+        grid: Grid,
+        selection: Selection,
+        cache: TranspositionTable | None = None,
+        stop: Optional[Callable[[], bool]] = None,
+        stats: Optional[SolverStats] = None,
+    ) -> list[tuple[Block, tuple[int, int]]] | None:
+        """Find the placement of every block whose board best survives future hands.
+
+        The same sampled hands are used for every candidate, so boards reached by
+        different branches share their memoised values. When the budget runs out
+        the best fully evaluated candidate is played, or the most promising one
+        by `evaluate` if none is. Stats cover the searches of every hand.
+        """
+        start = time.perf_counter()
+        try:
+            return self.plan(grid, selection, cache, stop, stats)
+        finally:
+            if stats is not None:
+                stats.elapsed += time.perf_counter() - start
+
+    def plan(
+        self,
+        grid: Grid,
+        selection: Selection,
+        cache: TranspositionTable | None = None,
+        stop: Optional[Callable[[], bool]] = None,
+        stats: Optional[SolverStats] = None,
+    ) -> list[tuple[Block, tuple[int, int]]] | None:
+        """Score the candidate placements and play the best one."""
+        deadline = time.perf_counter() + self.budget / 1000
+
+        def expired() -> bool:
+            return (stop is not None and stop()) or time.perf_counter() > deadline
+
+        candidates = []
+        try:
+            for placements in iter_solutions(
+                grid,
+                selection,
+                cache,
+                expired,
+                self.pruner,
+                True,
+                self.candidates,
+                stats,
+            ):
+                candidates.append((evaluate(grid), placements, grid.copy()))
+        except SolverInterrupted:
+            if stop is not None and stop():
+                raise
+        if not candidates:
+            candidates = [
+                (0, placements, grid.copy())
+                for placements in iter_solutions(
+                    grid, selection, cache, stop, self.pruner, limit=1, stats=stats
+                )
+            ]
+            if not candidates:
+                return None
+        candidates.sort(key=lambda c: c[0], reverse=True)
+
+        hands = self.sample(selection.hand_size)
+        self.memo = {}
+        best, best_value = candidates[0][1], None
+        for heuristic, placements, board in candidates:
+            try:
+                value = (
+                    self.value(board, hands, self.depth, cache, expired, stats),
+                    heuristic,
+                )
+            except SolverInterrupted:
+                if stop is not None and stop():
+                    raise
+                break
+            if best_value is None or value > best_value:
+                best, best_value = placements, value
+
+        for block, position in best:
+            grid.play(block, position)
+        return best
+
+    def value(
+        self,
+        grid: Grid,
+        hands: list[list[Block]],
+        depth: int,
+        cache: TranspositionTable | None = None,
+        stop: Optional[Callable[[], bool]] = None,
+        stats: Optional[SolverStats] = None,
+    ) -> float:
+        """Estimate the chance of placing `depth` more hands on a board."""
+        if depth <= 0:
+            return 1.0
+        key = (grid.occupancy(), depth)
+        if key in self.memo:
+            self.memo_hits += 1
+            return self.memo[key]
+
+        total = 0.0
+        for hand in hands:
+            self.evaluations += 1
+            best = 0.0
+            for _ in iter_solutions(
+                grid,
+                Selection(hand[:], grid.size, len(hand)),
+                cache,
+                stop,
+                self.pruner,
+                True,
+                1 if depth == 1 else self.branching,
+                stats,
+            ):
+                best = max(
+                    best,
+                    self.value(grid.copy(), hands, depth - 1, cache, stop, stats),
+                )
+                if best == 1.0:
+                    break
+            total += best
+        self.memo[key] = total / len(hands)
+        return self.memo[key]
+
+    def __repr__(self):
+        return (
+            f"LookaheadPlanner(depth={self.depth}, samples={self.samples}, "
+            f"{self.evaluations} evaluations, {self.memo_hits} memo hits)"
+        )
@@ -1,94 +1,226 @@
-import pygame
+import argparse
 import random
+import time
+from typing import Optional
+
+import pygame
 
-from config import SCREEN_RECT, TILE_SIZE, COLOR_PALETTE
+from config import (
+    DEFAULT_GRID_SIZE,
+    DEFAULT_HAND_SIZE,
+    FPS,
+    FONT_NAME,
+    FONT_SIZE,
+    OVERLAY_FONT_SIZE,
+)
 from block import Block
 from selection import Selection
 from grid import Grid
-from solver import solve
-
-
-class BlockBlast:
+from game import Game
+from lookahead import LookaheadPlanner
+from record import GameRecorder
+from render import Renderer, screen_size
+from spawner import Spawner
+from telemetry import Telemetry
+from transposition import TranspositionTable
+from worker import BackgroundWorker
+
+
+QUICK_SELECT_KEYS = [
+    pygame.K_a,
+    pygame.K_s,
+    pygame.K_d,
+    pygame.K_f,
+    pygame.K_g,
+    pygame.K_h,
+    pygame.K_j,
+    pygame.K_k,
+    pygame.K_l,
+]
+
+
+class BlockBlast(Game):
     def __init__(
         self,
         screen: pygame.Surface = None,
-        screen_rect: pygame.Rect = pygame.Rect(*SCREEN_RECT),
+        screen_rect: Optional[pygame.Rect] = None,
         grid: Grid = None,
         selection: Selection = None,
         score: int = 0,
         move_delay: int = 100,
         last_move_time: int = 0,
+        place_delay: int = 100,
+        fps: int = FPS,
         auto_solve: bool = False,
+        cache: Optional[TranspositionTable] = None,
+        spawner: Optional[Spawner] = None,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        stats_path: Optional[str] = None,
+        deadline: Optional[float] = 100,
+        grid_size: int = DEFAULT_GRID_SIZE,
+        hand_size: int = DEFAULT_HAND_SIZE,
+        record_path: Optional[str] = None,
+        telemetry_path: Optional[str] = None,
+        telemetry_interval: float = 5.0,
+        overlay: bool = False,
+        lookahead: Optional[LookaheadPlanner] = None,
     ) -> None:
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.record = None
+        recorder = None
+        if record_path is not None:
+            self.record = open(record_path, "ab")
+            recorder = GameRecorder(
+                self.record,
+                grid.size if grid is not None else grid_size,
+                hand_size,
+                seed if spawner is None else None,
+            )
+        super().__init__(
+            grid=grid,
+            selection=selection,
+            score=score,
+            cache=cache,
+            spawner=spawner,
+            workers=workers,
+            seed=seed,
+            record_stats=stats_path is not None,
+            deadline=deadline,
+            grid_size=grid_size,
+            hand_size=hand_size,
+            recorder=recorder,
+            lookahead=lookahead,
+        )
+        if screen_rect is None:
+            screen_rect = pygame.Rect(
+                0, 0, *screen_size(self.grid.size, self.selection.hand_size)
+            )
         if screen is None:
             screen = pygame.display.set_mode(screen_rect.size)
-        if grid is None:
-            grid = Grid()
-        if selection is None:
-            selection = Selection()
 
         self.screen: pygame.Surface = screen
         self.screen_rect: pygame.Rect = screen_rect
-        self.grid: Grid = grid
-        self.selection: Selection = selection
-        self.score: int = score
         self.move_delay: int = move_delay
         self.last_move_time: int = last_move_time
+        self.place_delay: int = place_delay
+        self.last_place_time: int = 0
         self.auto_solve: bool = auto_solve
+        self.stats_path: Optional[str] = stats_path
         self.running: bool = False
+        self.worker: BackgroundWorker = BackgroundWorker()
+        self.plan: list[tuple[Block, tuple[int, int]]] = []
+        self.fps: int = fps
+        self.clock = pygame.time.Clock()
+        self.telemetry: Optional[Telemetry] = None
+        self.overlay: bool = overlay
+        if telemetry_path is not None or overlay:
+            self.enable_telemetry(Telemetry(telemetry_path, telemetry_interval))
 
         pygame.init()
         self.screen = pygame.display.set_mode(self.screen_rect.size)
         pygame.display.set_caption("Block Blast")
-        self.font = pygame.font.SysFont("Arial", 24)
+        self.font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
+        self.renderer: Renderer = Renderer(
+            self.screen,
+            self.font,
+            self.grid.size,
+            overlay_font=pygame.font.SysFont(FONT_NAME, OVERLAY_FONT_SIZE),
+        )
+
+    def enable_telemetry(self, telemetry: Telemetry) -> None:
+        """Start collecting frame, input, solve and spawn metrics."""
+        self.telemetry = telemetry
+        self.grid.on_can_place = telemetry.count_can_place
 
     def loop(self) -> None:
         """Main game loop."""
         self.running = True
         while self.running:
+            if self.telemetry is not None:
+                self.telemetry.begin_frame()
             self.handle_events()
             self.handle_movement()
+            self.handle_results()
 
             if self.auto_solve:
+                self.auto_play()
+            elif not self.worker.busy and self.is_over():
+                self.game_over()
+                self.running = False
 
-                solution = solve(self.grid.copy(), self.selection.copy())
-
-                if not solution:
-                    self.game_over()
-                    self.running = False
-                    break
-
-                for block, position in solution:
-                    idx = -1
-                    for i, b in enumerate(self.selection.blocks):
-                        if block.shape == b.shape:
-                            idx = i
-                    self.selection.select(idx, initial_position=position)
-                    if not self.grid.can_place(
-                        self.selection.active, self.selection.active.position
-                    ):
-                        raise ValueError(
-                            f"Block\n{block}\ncannot be placed at {position}"
-                        )
-                    self.place_block()
-
-                    self.render()
+            if self.running:
+                self.render()
+            if self.telemetry is not None:
+                self.telemetry.end_frame()
+            self.clock.tick(self.fps)
 
-                    pygame.time.delay(100)
+        self.quit()
 
+    def handle_results(self) -> None:
+        """Consume the result of a finished background request."""
+        result = self.worker.poll()
+        if result is None:
+            return
+        kind, value = result
+        self.record_latency(kind)
+        if kind == "spawn":
+            self.deal(value)
+        elif kind == "solve":
+            if not value:
+                self.game_over()
+                self.running = False
             else:
-                if not any(self.grid.can_place(b) for b in self.selection.blocks):
-                    self.game_over()
-                    self.running = False
-                    break
+                self.plan = list(value)
 
-            self.render()
+    def record_latency(self, kind: str) -> None:
+        """Record the latency of the background request that just finished."""
+        telemetry = self.telemetry
+        if telemetry is None:
+            return
+        if kind == "spawn":
+            telemetry.record("spawn", self.spawner.last_stats.elapsed)
+            telemetry.record("complete", self.spawner.last_stats.search)
+        elif kind == "solve" and self.solve_times:
+            telemetry.record("solve", self.solve_times[-1])
+
+    def auto_play(self) -> None:
+        """Place the next planned block or request a solve of the hand."""
+        if self.worker.busy:
+            return
+        if not self.plan:
+            self.worker.submit(
+                "solve", self.solve, self.grid.copy(), self.selection.copy()
+            )
+            return
+        current_time = pygame.time.get_ticks()
+        if current_time - self.last_place_time < self.place_delay:
+            return
+        block, position = self.plan.pop(0)
+        self.play(block, position)
+        self.last_place_time = current_time
 
-        self.quit()
+    def interrupt(self) -> None:
+        """Drop a pending or planned solve after the user intervenes."""
+        self.worker.cancel("solve")
+        self.plan = []
+
+    def spawn_blocks(self) -> None:
+        """Request a new hand from the background worker."""
+        self.worker.submit("spawn", self.spawner.spawn, self.grid.copy())
 
     def toggle_auto_solve(self) -> None:
         """Toggle the auto-solve mode."""
         self.auto_solve = not self.auto_solve
+        if not self.auto_solve:
+            self.interrupt()
+
+    def toggle_overlay(self) -> None:
+        """Show or hide the telemetry overlay, collecting metrics from now on."""
+        self.overlay = not self.overlay
+        if self.telemetry is None:
+            self.enable_telemetry(Telemetry())
 
     def handle_events(self) -> None:
         """Handle user input events."""
@@ -96,6 +228,8 @@ class BlockBlast:
             if event.type == pygame.QUIT:
                 self.running = False
             if event.type == pygame.KEYDOWN:
+                if self.telemetry is not None:
+                    self.telemetry.input()
                 self.handle_keydown(event)
 
     def handle_keydown(self, event: pygame.event.Event) -> None:
@@ -103,17 +237,21 @@ class BlockBlast:
         if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
             self.toggle_auto_solve()
         elif event.key == pygame.K_SPACE:
+            self.interrupt()
             self.place_block()
         elif event.key == pygame.K_TAB:
+            self.interrupt()
             self.selection.cycle()
-        elif event.key in [pygame.K_a, pygame.K_s, pygame.K_d]:
+        elif event.key == pygame.K_F3:
+            self.toggle_overlay()
+        elif event.key in QUICK_SELECT_KEYS:
+            self.interrupt()
             self.quick_select(event.key)
 
     def quick_select(self, key: int) -> None:
-        """Select a block with ASD keys."""
-        key_to_idx = {pygame.K_a: 0, pygame.K_s: 1, pygame.K_d: 2}
-        idx = key_to_idx.get(key)
-        if idx is not None and idx < self.selection.len():
+        """Select a block with the home row keys, starting from A."""
+        idx = QUICK_SELECT_KEYS.index(key)
+        if idx < self.selection.len():
             self.selection.select(idx)
 
     def handle_movement(self) -> None:
@@ -134,73 +272,23 @@ class BlockBlast:
 
     def move_block(self, dx: int, dy: int) -> None:
         """Move the active block by dx and dy."""
-        self.selection.active.position = (
-            self.selection.active.position[0] + dy,
-            self.selection.active.position[1] + dx,
-        )
-
-    def place_block(self) -> None:
-        """Place the active block on the grid and update score."""
-        if self.grid.place(self.selection.active, self.selection.active.position):
-            self.score += self.selection.active.tile_count
-            self.score += self.grid.clear_full()
-            self.selection.pop()
-            if self.selection.len() <= 0:
-                self.spawn_blocks()
-
-    def spawn_blocks(self) -> None:
-        """Spawns new blocks in selection."""
-        blocks = [
-            random.choice([b for b in Block.all_blocks() if self.grid.can_place(b)])
-        ]
-        self.complete_blocks(blocks)
-        self.selection.spawn(blocks)
-
-    def complete_blocks(self, blocks: list[Block]) -> bool:
-        """Append blocks that are solvable."""
-        if len(blocks) == 3:
-            if solve(self.grid.copy(), Selection([b.copy() for b in blocks])):
-                return True
-            return False
-
-        shuffled_blocks = Block.all_blocks()[:]
-        random.shuffle(shuffled_blocks)
-
-        for block in shuffled_blocks:
-            blocks.append(block)
-            if self.complete_blocks(blocks):
-                return True
-            blocks.pop()
-
-        return False
-
-    def render_score(self, offset: tuple[int, int] = (0, 0)) -> None:
-        """Render the score."""
-        score_text = self.font.render(f"{self.score}", True, COLOR_PALETTE["fore"])
-        self.screen.blit(score_text, offset)
+        y, x = self.selection.active.position
+        self.selection.select(self.selection.idx, (y + dy, x + dx))
 
     def render(self) -> None:
         """Render the game screen."""
-        self.screen.fill(COLOR_PALETTE["back"])
-        offset = (2 * TILE_SIZE, 1 * TILE_SIZE)
-        self.grid.render(self.screen, offset=offset)
-        self.selection.active.render(
-            self.screen,
-            position=self.selection.active.position,
-            offset=offset,
-            fill_color=COLOR_PALETTE[
-                (
-                    "tile"
-                    if self.grid.can_place(
-                        self.selection.active, self.selection.active.position
-                    )
-                    else "tile-error"
-                )
-            ],
+        if self.telemetry is None:
+            self.renderer.draw(self.grid, self.selection, self.score, self.worker.busy)
+            return
+        start = time.perf_counter()
+        self.renderer.draw(
+            self.grid,
+            self.selection,
+            self.score,
+            self.worker.busy,
+            self.telemetry.overlay() if self.overlay else None,
         )
-        self.selection.render(self.screen, offset=(0, offset[1]))
-        self.render_score((10, 10))
-        pygame.display.flip()
+        self.telemetry.rendered(start)
 
     def game_over(self) -> None:
         """Display game over."""
@@ -208,11 +296,76 @@ class BlockBlast:
         pygame.time.delay(2500)
 
     def quit(self) -> None:
+        self.worker.close()
+        self.close()
+        if self.stats_path is not None:
+            self.dump_stats(self.stats_path)
+        if self.record is not None:
+            self.record.close()
+        if self.telemetry is not None:
+            self.telemetry.export()
         pygame.quit()
 
 
 def start_game() -> None:
-    game = BlockBlast()
+    parser = argparse.ArgumentParser(description="Play Block Blast.")
+    parser.add_argument(
+        "--stats", metavar="PATH", help="write solver stats of every solve as JSONL"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=100,
+        help="ms spent improving each auto-solved hand, 0 for the first solution",
+    )
+    parser.add_argument(
+        "--lookahead",
+        type=int,
+        metavar="DEPTH",
+        help="auto-solve by the solvability of DEPTH sampled future hands",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=8, help="future hands sampled per board"
+    )
+    parser.add_argument(
+        "--budget", type=float, default=200, help="lookahead time budget in ms"
+    )
+    parser.add_argument(
+        "--record", metavar="PATH", help="append the game to a binary record file"
+    )
+    parser.add_argument(
+        "--telemetry",
+        metavar="PATH",
+        help="append frame, input, solve and spawn metrics to a .csv or .jsonl file",
+    )
+    parser.add_argument(
+        "--telemetry-interval",
+        type=float,
+        default=5.0,
+        help="seconds between telemetry snapshots",
+    )
+    parser.add_argument(
+        "--overlay", action="store_true", help="show live metrics, toggled with F3"
+    )
+    parser.add_argument("--seed", type=int, help="seed the dealt hands")
+    parser.add_argument("--size", type=int, default=DEFAULT_GRID_SIZE)
+    parser.add_argument("--hand", type=int, default=DEFAULT_HAND_SIZE)
+    args = parser.parse_args()
+    lookahead = None
+    if args.lookahead is not None:
+        lookahead = LookaheadPlanner(args.lookahead, args.samples, args.budget)
+    game = BlockBlast(
+        seed=args.seed,
+        stats_path=args.stats,
+        deadline=args.deadline or None,
+        grid_size=args.size,
+        hand_size=args.hand,
+        record_path=args.record,
+        telemetry_path=args.telemetry,
+        telemetry_interval=args.telemetry_interval,
+        overlay=args.overlay,
+        lookahead=lookahead,
+    )
     game.loop()
 
 
@@ -0,0 +1,204 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.synchronize import Event
+from typing import Callable, Optional
+
+from block import Block
+from selection import Selection
+from grid import Grid
+from pruning import Pruner
+from solver import SolverInterrupted, SolverStats, backtrack
+from transposition import TranspositionTable
+
+
+STOP_POLL = 0.01
+
+_worker_stop: Optional[Event] = None
+_worker_cache: Optional[TranspositionTable] = None
+_worker_pruner: Optional[Pruner] = None
+
+
+def _init_worker(stop: Event, pruning: bool = False) -> None:
+    """Set up the stop flag, cache and pruner shared by the tasks of a worker."""
+    global _worker_stop, _worker_cache, _worker_pruner
+    _worker_stop = stop
+    _worker_cache = TranspositionTable()
+    _worker_pruner = Pruner() if pruning else None
+
+
+def _solve_root(
+    grid_type: type[Grid],
+    state: tuple[int, int],
+    keys: list[tuple],
+    idx: int,
+    position: tuple[int, int],
+    record_stats: bool = False,
+) -> tuple[list[tuple[int, tuple[int, int]]] | None, Optional[SolverStats]]:
+    """Solve the subtree below one root move and return block indices and stats."""
+    grid = grid_type.from_state(state)
+    blocks = [Block.from_key(key) for key in keys]
+    grid.play(blocks[idx], position)
+    remaining = blocks[:idx] + blocks[idx + 1 :]
+    stats = SolverStats() if record_stats else None
+    try:
+        result = backtrack(
+            grid,
+            remaining,
+            [],
+            _worker_cache,
+            _worker_stop.is_set if _worker_stop is not None else None,
+            _worker_pruner,
+            stats,
+        )
+    except SolverInterrupted:
+        return None, stats
+    if result is None:
+        return None, stats
+    index = {id(b): i for i, b in enumerate(blocks)}
+    return [(idx, position)] + [(index[id(b)], p) for b, p in result], stats
+
+
+class ParallelSolver:
+    def __init__(self, workers: Optional[int] = None, pruning: bool = False) -> None:
+        """Initialize a solver that splits root moves across processes."""
+        self.workers: int = workers or os.cpu_count() or 1
+        self.pruning: bool = pruning
+        self.stop = multiprocessing.Event()
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def solve(
+        self,
+        grid: Grid,
+        selection: Selection,
+        cache: TranspositionTable | None = None,
+        stop: Optional[Callable[[], bool]] = None,
+        stats: Optional[SolverStats] = None,
+    ) -> list[tuple[Block, tuple[int, int]]] | None:
+        """Find a placement for every block, or None if there is none.
+
+        The `stop` callback is polled while the workers search; once it returns
+        true they are interrupted and SolverInterrupted is raised. Stats add up
+        the searches of the workers whose results came back, and the wall time
+        of the whole solve.
+        """
+        start = time.perf_counter()
+        try:
+            return self.split(grid, selection, cache, stop, stats)
+        finally:
+            if stats is not None:
+                stats.elapsed += time.perf_counter() - start
+
+    def split(
+        self,
+        grid: Grid,
+        selection: Selection,
+        cache: TranspositionTable | None = None,
+        stop: Optional[Callable[[], bool]] = None,
+        stats: Optional[SolverStats] = None,
+    ) -> list[tuple[Block, tuple[int, int]]] | None:
+        """Solve the root moves in the worker processes."""
+        blocks = list(selection.blocks)
+        if cache is not None:
+            key = cache.key(grid, blocks)
+            if cache.is_dead(key):
+                if stats is not None:
+                    stats.cache_hits += 1
+                return None
+
+        if len(blocks) <= 1 or self.workers <= 1:
+            return backtrack(
+                grid,
+                blocks,
+                [],
+                cache,
+                stop,
+                Pruner() if self.pruning else None,
+                stats,
+            )
+
+        roots = []
+        seen = set()
+        for idx, block in enumerate(blocks):
+            if block.shape in seen:
+                continue
+            seen.add(block.shape)
+            for position in grid.legal_positions(block):
+                roots.append((grid.count_cleared(block, position), idx, position))
+        roots.sort(key=lambda r: r[0], reverse=True)
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.stop, self.pruning),
+            )
+
+        self.stop.clear()
+        state = grid.state()
+        keys = [b.key for b in blocks]
+        record_stats = stats is not None
+        pending = {
+            self.executor.submit(
+                _solve_root, type(grid), state, keys, idx, position, record_stats
+            )
+            for _, idx, position in roots
+        }
+        result = None
+        interrupted = False
+        while pending and result is None and not interrupted:
+            done, pending = wait(
+                pending,
+                timeout=STOP_POLL if stop is not None else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                found, worker_stats = future.result()
+                if stats is not None and worker_stats is not None:
+                    stats.add(worker_stats)
+                if found is not None:
+                    result = found
+                    break
+            interrupted = result is None and stop is not None and stop()
+
+        self.stop.set()
+        for future in pending:
+            future.cancel()
+        wait(pending)
+
+        if interrupted:
+            raise SolverInterrupted
+        if result is None:
+            if cache is not None:
+                cache.mark_dead(key)
+            return None
+
+        placements = []
+        for idx, position in result:
+            grid.play(blocks[idx], position)
+            placements.append((blocks[idx], position))
+        return placements
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def __enter__(self) -> "ParallelSolver":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def solve_parallel(
+    grid: Grid,
+    selection: Selection,
+    workers: Optional[int] = None,
+    cache: TranspositionTable | None = None,
+) -> list[tuple[Block, tuple[int, int]]] | None:
+    """Solve with root moves split across a pool of worker processes."""
+    with ParallelSolver(workers) as solver:
+        return solver.solve(grid, selection, cache)
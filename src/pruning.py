@@ -0,0 +1,164 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from block import Block
+from grid import Grid
+from bitgrid import line_masks
+
+
+class PruneContext:
+    def __init__(
+        self, grid: Grid, blocks: list[Block], legal: list[list[tuple[int, int]]]
+    ) -> None:
+        """Gather the masks shared by the pruning rules at one search node."""
+        self.grid: Grid = grid
+        self.blocks: list[Block] = blocks
+        self.legal: list[list[tuple[int, int]]] = legal
+        self.occupied: int = grid.occupancy()
+        self.empty: int = ((1 << (grid.size * grid.size)) - 1) & ~self.occupied
+        self.masks: list[list[int]] = [
+            [block.placements(grid.size)[p] for p in positions]
+            for block, positions in zip(blocks, legal)
+        ]
+        self.reach: int = 0
+        for masks in self.masks:
+            for mask in masks:
+                self.reach |= mask
+        self._clearable: Optional[bool] = None
+
+    @property
+    def clearable(self) -> bool:
+        """Check if any line could still be completed by the remaining blocks."""
+        if self._clearable is None:
+            tiles = sum(block.tile_count for block in self.blocks)
+            rows, cols = line_masks(self.grid.size)
+            self._clearable = any(
+                missing & ~self.reach == 0 and missing.bit_count() <= tiles
+                for missing in (line & self.empty for line in rows + cols)
+            )
+        return self._clearable
+
+
+class PruningRule(ABC):
+    name: str = "rule"
+
+    def __init__(self, enabled: bool = True) -> None:
+        """Initialize a pruning rule and its counters."""
+        self.enabled: bool = enabled
+        self.checks: int = 0
+        self.cuts: int = 0
+
+    @abstractmethod
+    def prune(self, context: PruneContext) -> bool:
+        """Check if the node can be proven to have no solution."""
+
+
+class Feasibility(PruningRule):
+    name = "feasibility"
+
+    def prune(self, context: PruneContext) -> bool:
+        """Cut when a block has no position and no line can be cleared to make room."""
+        if all(context.legal):
+            return False
+        return not context.clearable
+
+
+class Capacity(PruningRule):
+    name = "capacity"
+
+    def prune(self, context: PruneContext) -> bool:
+        """Cut when the reachable empty cells cannot hold the remaining tiles."""
+        tiles = sum(block.tile_count for block in context.blocks)
+        if context.reach.bit_count() >= tiles:
+            return False
+        return not context.clearable
+
+
+class Regions(PruningRule):
+    name = "regions"
+
+    def prune(self, context: PruneContext) -> bool:
+        """Cut when the blocks confined to one empty region overflow it."""
+        regions = empty_regions(context.empty, context.grid.size)
+        if len(regions) <= 1:
+            return False
+        load = [0] * len(regions)
+        for block, masks in zip(context.blocks, context.masks):
+            touched = {
+                i for mask in masks for i, region in enumerate(regions) if mask & region
+            }
+            if len(touched) == 1:
+                load[touched.pop()] += block.tile_count
+        if all(
+            load[i] <= (region & context.reach).bit_count()
+            for i, region in enumerate(regions)
+        ):
+            return False
+        return not context.clearable
+
+
+def empty_regions(empty: int, size: int) -> list[int]:
+    """Split the empty cells into 4-connected regions as bitmasks."""
+    rows, cols = line_masks(size)
+    not_first_col = ~cols[0]
+    not_last_col = ~cols[-1]
+    regions = []
+    while empty:
+        region = empty & -empty
+        while True:
+            grown = region
+            grown |= (region << 1) & not_first_col
+            grown |= (region >> 1) & not_last_col
+            grown |= region << size
+            grown |= region >> size
+            grown &= empty
+            if grown == region:
+                break
+            region = grown
+        regions.append(region)
+        empty &= ~region
+    return regions
+
+
+class Pruner:
+    def __init__(self, rules: Optional[list[PruningRule]] = None) -> None:
+        """Initialize a set of toggleable pruning rules."""
+        self.rules: list[PruningRule] = (
+            rules if rules is not None else [Feasibility(), Capacity(), Regions()]
+        )
+
+    def prune(
+        self, grid: Grid, blocks: list[Block], legal: list[list[tuple[int, int]]]
+    ) -> bool:
+        """Check the enabled rules in order and stop at the first that cuts."""
+        context = None
+        for rule in self.rules:
+            if not rule.enabled:
+                continue
+            if context is None:
+                context = PruneContext(grid, blocks, legal)
+            rule.checks += 1
+            if rule.prune(context):
+                rule.cuts += 1
+                return True
+        return False
+
+    def toggle(self, name: str, enabled: bool) -> None:
+        """Enable or disable a rule by name."""
+        for rule in self.rules:
+            if rule.name == name:
+                rule.enabled = enabled
+                return
+        raise ValueError(f"Pruning rule '{name}' not found.")
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Get the checks and cuts of every rule."""
+        return {
+            rule.name: {"checks": rule.checks, "cuts": rule.cuts} for rule in self.rules
+        }
+
+    def reset(self) -> None:
+        """Reset the counters of every rule."""
+        for rule in self.rules:
+            rule.checks = 0
+            rule.cuts = 0
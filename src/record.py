@@ -0,0 +1,213 @@
+import argparse
+import struct
+import time
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Optional
+
+from block import Block, Shape
+from selection import Selection
+from grid import Grid
+from solver import solve
+
+
+MAGIC = b"BBGR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBB?q")
+HAND = 1
+PLACE = 2
+PLACE_EVENT = struct.Struct("<BBBB")
+
+
+class Placement(NamedTuple):
+    """A recorded placement and the lines it cleared."""
+
+    block: Block
+    position: tuple[int, int]
+    lines: int
+
+
+class GameLog(NamedTuple):
+    """A recorded game: its settings and its hands and placements in order."""
+
+    seed: Optional[int]
+    grid_size: int
+    hand_size: int
+    events: list[list[Block] | Placement]
+
+
+def shape_ids() -> dict[Shape, int]:
+    """Map the shapes of the catalogue to the ids used in records."""
+    return {shape: i for i, shape in enumerate(Shape.catalogue())}
+
+
+class GameRecorder:
+    def __init__(
+        self,
+        file: BinaryIO,
+        grid_size: int,
+        hand_size: int,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Start a game record by appending its header to a binary file.
+
+        A record is the header followed by hand events, a tag, a count and one
+        shape id per block, and placement events, a tag, a shape id, the y and
+        x offsets and the lines cleared, one byte each. Several games can be
+        appended to the same file.
+        """
+        self.file: BinaryIO = file
+        self.ids: dict[Shape, int] = shape_ids()
+        file.write(
+            HEADER.pack(
+                MAGIC, VERSION, grid_size, hand_size, seed is not None, seed or 0
+            )
+        )
+
+    def hand(self, blocks: list[Block]) -> None:
+        """Append a dealt hand."""
+        self.file.write(
+            bytes([HAND, len(blocks)] + [self.ids[b.shape] for b in blocks])
+        )
+
+    def place(self, block: Block, position: tuple[int, int], lines: int) -> None:
+        """Append a placement and the number of lines it cleared."""
+        self.file.write(
+            bytes([PLACE]) + PLACE_EVENT.pack(self.ids[block.shape], *position, lines)
+        )
+
+    def flush(self) -> None:
+        """Write buffered events to the file."""
+        self.file.flush()
+
+
+def iter_games(file: BinaryIO) -> Iterator[GameLog]:
+    """Stream the games of a record file, tolerating a truncated last event."""
+    shapes = list(Shape.catalogue())
+    log = None
+    while True:
+        tag = file.read(1)
+        if not tag:
+            break
+        if tag == MAGIC[:1]:
+            data = tag + file.read(HEADER.size - 1)
+            if len(data) < HEADER.size:
+                break
+            magic, version, grid_size, hand_size, has_seed, seed = HEADER.unpack(data)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Not a game record.")
+            if log is not None:
+                yield log
+            log = GameLog(seed if has_seed else None, grid_size, hand_size, [])
+        elif log is None:
+            raise ValueError("Not a game record.")
+        elif tag[0] == HAND:
+            count = file.read(1)
+            ids = file.read(count[0]) if count else b""
+            if not count or len(ids) < count[0]:
+                break
+            log.events.append([Block(shapes[i]) for i in ids])
+        elif tag[0] == PLACE:
+            data = file.read(PLACE_EVENT.size)
+            if len(data) < PLACE_EVENT.size:
+                break
+            shape, y, x, lines = PLACE_EVENT.unpack(data)
+            log.events.append(Placement(Block(shapes[shape]), (y, x), lines))
+        else:
+            raise ValueError(f"Unknown event tag {tag[0]}.")
+    if log is not None:
+        yield log
+
+
+def read_games(path: str) -> Iterator[GameLog]:
+    """Stream the games recorded in a file."""
+    with open(path, "rb") as f:
+        yield from iter_games(f)
+
+
+def replay(
+    log: GameLog,
+    grid_type: type = Grid,
+    on_hand: Optional[Callable[[Grid, list[Block]], None]] = None,
+) -> tuple[Grid, int]:
+    """Replay a game headlessly, checking its clears, and return the grid and score.
+
+    `on_hand` is called with the grid and every dealt hand before it is played,
+    for example to re-solve historical positions.
+    """
+    grid = grid_type(log.grid_size)
+    score = 0
+    for event in log.events:
+        if isinstance(event, Placement):
+            if not grid.place(event.block, event.position):
+                raise ValueError(f"Recorded placement at {event.position} is illegal.")
+            lines = grid.clear_full()
+            if lines != event.lines:
+                raise ValueError(
+                    f"Recorded placement cleared {event.lines} lines, not {lines}."
+                )
+            score += event.block.tile_count + lines
+        elif on_hand is not None:
+            on_hand(grid, event)
+    return grid, score
+
+
+def retime(
+    path: str, solver: Callable = solve, grid_type: type = Grid
+) -> Iterator[tuple[Optional[int], int, float, bool]]:
+    """Re-solve every recorded hand and yield the seed, hand, time and result."""
+    for log in read_games(path):
+        hands = []
+
+        def on_hand(grid: Grid, blocks: list[Block]) -> None:
+            board = grid.copy()
+            selection = Selection(
+                [b.copy() for b in blocks], log.grid_size, log.hand_size
+            )
+            start = time.perf_counter()
+            solution = solver(board, selection)
+            hands.append((time.perf_counter() - start, solution is not None))
+
+        replay(log, grid_type, on_hand)
+        for i, (elapsed, solved) in enumerate(hands):
+            yield log.seed, i, elapsed, solved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded games headlessly.")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument(
+        "--retime", action="store_true", help="re-solve every recorded hand"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="number of slowest hands to list"
+    )
+    args = parser.parse_args()
+
+    if args.retime:
+        results = [
+            (elapsed, path, seed, hand, solved)
+            for path in args.paths
+            for seed, hand, elapsed, solved in retime(path)
+        ]
+        results.sort(reverse=True)
+        print(f"hands:      {len(results)} in {sum(r[0] for r in results):.2f}s")
+        for elapsed, path, seed, hand, solved in results[: args.top]:
+            print(
+                f"{elapsed * 1000:10.2f} ms  {path} seed={seed} hand={hand}"
+                + ("" if solved else " unsolvable")
+            )
+        return
+
+    games = placements = 0
+    start = time.perf_counter()
+    for path in args.paths:
+        for log in read_games(path):
+            replay(log)
+            games += 1
+            placements += sum(isinstance(e, Placement) for e in log.events)
+    elapsed = time.perf_counter() - start
+    print(f"games:      {games} in {elapsed:.2f}s")
+    print(f"moves/s:    {placements / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import pygame
+from typing import Optional
+
+from config import TILE_SIZE, MAX_GRID_PIXELS, COLOR_PALETTE
+from block import Block
+from selection import Selection
+from grid import Grid
+
+
+def tile_size(grid_size: int) -> int:
+    """Get the tile size that keeps the grid within the maximum grid pixels."""
+    return max(1, min(TILE_SIZE, MAX_GRID_PIXELS // grid_size))
+
+
+def screen_size(grid_size: int, hand_size: int) -> tuple[int, int]:
+    """Get the window size laid out around a grid and a hand of the given sizes."""
+    size = tile_size(grid_size)
+    hand_tile = TILE_SIZE // 2
+    hand_width = hand_size * 5 * hand_tile + (hand_size - 1) * 3 * hand_tile
+    hand_top = (grid_size + 1) * size + size // 2
+    return (
+        max((grid_size + 4) * size, hand_width + 2 * hand_tile),
+        hand_top + 5 * hand_tile + 80,
+    )
+
+
+class Renderer:
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        font: pygame.font.Font,
+        grid_size: int,
+        grid_offset: Optional[tuple[int, int]] = None,
+        score_offset: tuple[int, int] = (10, 10),
+        overlay_font: Optional[pygame.font.Font] = None,
+    ) -> None:
+        """Initialize a renderer that only redraws what changed between frames."""
+        self.screen: pygame.Surface = screen
+        self.font: pygame.font.Font = font
+        self.grid_size: int = grid_size
+        self.tile_size: int = tile_size(grid_size)
+        self.grid_offset: tuple[int, int] = (
+            grid_offset
+            if grid_offset is not None
+            else (2 * self.tile_size, 1 * self.tile_size)
+        )
+        self.score_offset: tuple[int, int] = score_offset
+        self.overlay_font: pygame.font.Font = (
+            overlay_font if overlay_font is not None else font
+        )
+
+        self.tiles: dict[tuple[str, int], pygame.Surface] = {}
+        self.texts: dict[tuple[str, str], pygame.Surface] = {}
+        self.background: pygame.Surface = self.render_background()
+        self.selection_rect = pygame.Rect(
+            0,
+            (grid_size + 1) * self.tile_size + self.tile_size // 2,
+            self.screen.get_width(),
+            5 * (TILE_SIZE // 2),
+        )
+
+        self.bits: Optional[int] = None
+        self.active: tuple[frozenset, str] = (frozenset(), "tile")
+        self.hand: Optional[tuple] = None
+        self.score_rect: Optional[pygame.Rect] = None
+        self.score: Optional[int] = None
+        self.thinking_rect: Optional[pygame.Rect] = None
+        self.overlay: Optional[list[str]] = None
+        self.overlay_rect: Optional[pygame.Rect] = None
+
+    def tile(self, color: str, tile_size: Optional[int] = None) -> pygame.Surface:
+        """Get a pre-rendered filled and outlined tile."""
+        if tile_size is None:
+            tile_size = self.tile_size
+        key = (color, tile_size)
+        if key not in self.tiles:
+            surface = pygame.Surface((tile_size, tile_size)).convert()
+            surface.fill(COLOR_PALETTE[color])
+            pygame.draw.rect(
+                surface, COLOR_PALETTE["fore"], (0, 0, tile_size, tile_size), 1
+            )
+            self.tiles[key] = surface
+        return self.tiles[key]
+
+    def text(self, text: str, color: str) -> pygame.Surface:
+        """Get a rendered text surface, rendering it only the first time."""
+        key = (text, color)
+        if key not in self.texts:
+            self.texts[key] = self.font.render(text, True, COLOR_PALETTE[color])
+        return self.texts[key]
+
+    def render_background(self) -> pygame.Surface:
+        """Render the static layer with the empty grid outlines."""
+        background = pygame.Surface(self.screen.get_size()).convert()
+        background.fill(COLOR_PALETTE["back"])
+        for y in range(self.grid_size):
+            for x in range(self.grid_size):
+                pygame.draw.rect(
+                    background, COLOR_PALETTE["fore"], self.cell_rect(y, x), 1
+                )
+        return background
+
+    def cell_rect(self, y: int, x: int) -> pygame.Rect:
+        """Get the screen rectangle of a grid cell."""
+        return pygame.Rect(
+            x * self.tile_size + self.grid_offset[0],
+            y * self.tile_size + self.grid_offset[1],
+            self.tile_size,
+            self.tile_size,
+        )
+
+    def invalidate(self) -> None:
+        """Force a full redraw on the next frame."""
+        self.bits = None
+
+    def draw(
+        self,
+        grid: Grid,
+        selection: Selection,
+        score: int,
+        thinking: bool,
+        overlay: Optional[list[str]] = None,
+    ) -> None:
+        """Redraw the changed parts of the screen and update only those areas."""
+        full = self.bits is None
+        if full:
+            self.screen.blit(self.background, (0, 0))
+            self.hand = None
+            self.score = None
+            self.score_rect = None
+            self.thinking_rect = None
+            self.overlay = None
+            self.overlay_rect = None
+
+        dirty = self.draw_grid(grid, selection, full)
+        dirty += self.draw_selection(selection)
+        dirty += self.draw_score(score)
+        dirty += self.draw_thinking(thinking)
+        dirty += self.draw_overlay(overlay)
+
+        if full:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+
+    def draw_grid(
+        self, grid: Grid, selection: Selection, full: bool
+    ) -> list[pygame.Rect]:
+        """Redraw grid cells whose content or overlaid active block changed."""
+        bits = grid.occupancy()
+        active = self.active_cells(grid, selection)
+        if full or self.bits is None:
+            cells = {(y, x) for y in range(grid.size) for x in range(grid.size)}
+        else:
+            changed = bits ^ self.bits
+            cells = {
+                divmod(i, grid.size) for i in range(grid.size**2) if changed >> i & 1
+            }
+            if active != self.active:
+                cells |= self.active[0] | active[0]
+        self.bits = bits
+        self.active = active
+
+        dirty = []
+        for y, x in cells:
+            rect = self.cell_rect(y, x)
+            if (y, x) in active[0]:
+                self.screen.blit(self.tile(active[1]), rect)
+            elif bits >> (y * grid.size + x) & 1:
+                self.screen.blit(self.tile("tile"), rect)
+            else:
+                self.screen.blit(self.background, rect, rect)
+            dirty.append(rect)
+        return dirty
+
+    def active_cells(self, grid: Grid, selection: Selection) -> tuple[frozenset, str]:
+        """Get the cells covered by the active block and its tile color."""
+        if selection.len() <= 0:
+            return frozenset(), "tile"
+        block = selection.active
+        y, x = block.position
+        cells = frozenset((y + i, x + j) for i, j in block.shape.cells)
+        color = "tile" if grid.can_place(block, block.position) else "tile-error"
+        return cells, color
+
+    def draw_selection(self, selection: Selection) -> list[pygame.Rect]:
+        """Redraw the hand when its blocks or the active index changed."""
+        hand = (tuple(b.shape for b in selection.blocks), selection.idx)
+        if hand == self.hand:
+            return []
+        self.hand = hand
+
+        self.screen.blit(self.background, self.selection_rect, self.selection_rect)
+        tile_size = TILE_SIZE // 2
+        spacing = 3 * tile_size
+        width = (
+            sum(block.width for block in selection.blocks if isinstance(block, Block))
+            * tile_size
+            + (selection.len() - 1) * spacing
+        )
+        offset_x = (self.screen.get_width() - width) // 2
+        offset_y = self.selection_rect.y
+
+        for i, block in enumerate(b for b in selection.blocks if b):
+            tile = self.tile("tile" if selection.idx == i else "tile-muted", tile_size)
+            for row, col in block.shape.cells:
+                self.screen.blit(
+                    tile, (offset_x + col * tile_size, offset_y + row * tile_size)
+                )
+            offset_x += block.width * tile_size + spacing
+        return [self.selection_rect]
+
+    def draw_score(self, score: int) -> list[pygame.Rect]:
+        """Re-render the score text only when the score changed."""
+        if score == self.score:
+            return []
+        self.score = score
+        dirty = []
+        if self.score_rect is not None:
+            self.screen.blit(self.background, self.score_rect, self.score_rect)
+            dirty.append(self.score_rect)
+        surface = self.font.render(f"{score}", True, COLOR_PALETTE["fore"])
+        self.score_rect = self.screen.blit(surface, self.score_offset)
+        dirty.append(self.score_rect)
+        return dirty
+
+    def draw_thinking(self, thinking: bool) -> list[pygame.Rect]:
+        """Show or hide the notice drawn while the background worker is busy."""
+        rect = self.thinking_rect
+        if rect is not None:
+            if thinking:
+                return []
+            self.screen.blit(self.background, rect, rect)
+            self.thinking_rect = None
+            return [rect]
+        if not thinking:
+            return []
+        surface = self.text("thinking...", "tile-muted")
+        offset = (
+            self.screen.get_width() - surface.get_width() - self.score_offset[0],
+            self.score_offset[1],
+        )
+        rect = self.screen.blit(surface, offset)
+        self.thinking_rect = rect
+        return [rect]
+
+    def draw_overlay(self, lines: Optional[list[str]]) -> list[pygame.Rect]:
+        """Redraw the telemetry lines at the bottom left when they changed."""
+        if lines == self.overlay:
+            return []
+        self.overlay = lines
+        dirty = []
+        if self.overlay_rect is not None:
+            self.screen.blit(self.background, self.overlay_rect, self.overlay_rect)
+            dirty.append(self.overlay_rect)
+            self.overlay_rect = None
+        if not lines:
+            return dirty
+
+        surfaces = [
+            self.overlay_font.render(line, True, COLOR_PALETTE["tile-muted"])
+            for line in lines
+        ]
+        y = self.screen.get_height() - sum(s.get_height() for s in surfaces) - 5
+        rects = []
+        for surface in surfaces:
+            rects.append(self.screen.blit(surface, (self.score_offset[0], y)))
+            y += surface.get_height()
+        self.overlay_rect = rects[0].unionall(rects[1:])
+        dirty.append(self.overlay_rect)
+        return dirty
@@ -1,14 +1,20 @@
-import pygame
 from random import shuffle
 from typing import Optional
 
-from config import SCREEN_WIDTH, GRID_SIZE, TILE_SIZE, COLOR_PALETTE
+from config import DEFAULT_GRID_SIZE, DEFAULT_HAND_SIZE
 from block import Block
 
 
 class Selection:
-    def __init__(self, blocks: Optional[list[Block]] = None) -> None:
+    def __init__(
+        self,
+        blocks: Optional[list[Block]] = None,
+        grid_size: int = DEFAULT_GRID_SIZE,
+        hand_size: int = DEFAULT_HAND_SIZE,
+    ) -> None:
         """Initialize the selection with random blocks."""
+        self.grid_size: int = grid_size
+        self.hand_size: int = hand_size
         if blocks:
             self.blocks: list[Block] = blocks
             self.idx: int = 0
@@ -18,13 +24,12 @@ class Selection:
 
     def spawn(self, blocks: Optional[list[Block]] = None) -> None:
         """Spawn a set of unique random blocks."""
-        N = 3
-        if blocks and len(blocks) == N:
+        if blocks and len(blocks) == self.hand_size:
             self.blocks = blocks
         else:
-            all_blocks = Block.all_blocks()
+            all_blocks = Block.all_blocks()[:]
             shuffle(all_blocks)
-            self.blocks = all_blocks[:N]
+            self.blocks = [block.copy() for block in all_blocks[: self.hand_size]]
         self.idx = 0
         self.active = self.blocks[self.idx]
 
@@ -40,9 +45,12 @@ class Selection:
             self.active = self.blocks[self.idx]
 
         self.active.position = initial_position
+        self.active.adjust_position(self.grid_size)
 
     def cycle(self) -> None:
-        """Cycle to the next block in the selection."""
+        """Cycle to the next block in the selection, if there is any."""
+        if not self.blocks:
+            return
         self.idx = (self.idx + 1) % len(self.blocks)
         self.select(self.idx)
 
@@ -60,34 +68,11 @@ class Selection:
 
     def copy(self):
         """Make a copy of the current selection."""
-        return Selection(blocks=[block.copy() for block in self.blocks])
-
-    def render(
-        self,
-        screen: pygame.Surface,
-        offset: tuple[int, int] = (0, 0),
-        tile_size: int = TILE_SIZE // 2,
-    ) -> None:
-        """Render all blocks in the selection on the screen."""
-        spacing = 3 * tile_size
-        width = (
-            sum(block.width for block in self.blocks if isinstance(block, Block))
-            * tile_size
-            + (self.len() - 1) * spacing
+        return Selection(
+            blocks=[block.copy() for block in self.blocks],
+            grid_size=self.grid_size,
+            hand_size=self.hand_size,
         )
-        offset_x = offset[0] + (SCREEN_WIDTH - width) // 2
-        offset_y = (GRID_SIZE) * TILE_SIZE + tile_size + offset[1]
-
-        for i, block in enumerate(b for b in self.blocks if b):
-            fill_color = COLOR_PALETTE["tile" if self.idx == i else "tile-muted"]
-            block.render(
-                screen,
-                fill_color=fill_color,
-                position=(0, 0),
-                offset=(offset_x, offset_y),
-                tile_size=tile_size,
-            )
-            offset_x += block.width * tile_size + spacing
 
     def __repr__(self):
         return "\n\n".join(f"{b}" for b in self.blocks)
@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from grid import Grid
+from game import Game
+from lookahead import LookaheadPlanner
+from spawner import Spawner
+from record import GameRecorder
+from store import SolvabilityStore, compact
+from telemetry import percentile
+from transposition import TranspositionTable
+
+
+def run_game(
+    seed: int,
+    max_hands: int,
+    time_budget: float,
+    record_stats: bool = False,
+    deadline: Optional[float] = None,
+    store_path: Optional[str] = None,
+    record_dir: Optional[str] = None,
+    lookahead: Optional[tuple[int, int, float]] = None,
+) -> dict:
+    """Auto-play one seeded game headlessly and return its results."""
+    cache = TranspositionTable()
+    grid = Grid()
+    store = None
+    if store_path is not None:
+        store = SolvabilityStore(store_path, journal=journal_path(store_path, seed))
+    spawner = Spawner(
+        cache=cache, time_budget=time_budget, rng=random.Random(seed), store=store
+    )
+    record = recorder = None
+    if record_dir is not None:
+        record = open(os.path.join(record_dir, f"game-{seed}.bbgr"), "wb")
+        recorder = GameRecorder(record, grid.size, spawner.hand_size, seed)
+    planner = None
+    if lookahead is not None:
+        depth, samples, budget = lookahead
+        planner = LookaheadPlanner(depth, samples, budget, rng=random.Random(seed))
+    game = Game(
+        grid=grid,
+        cache=cache,
+        spawner=spawner,
+        record_stats=record_stats,
+        deadline=deadline,
+        store=store,
+        recorder=recorder,
+        lookahead=planner,
+    )
+    start = time.perf_counter()
+    game.run(max_hands)
+    game.close()
+    if record is not None:
+        record.close()
+    return {
+        "seed": seed,
+        "score": game.score,
+        "moves": game.moves,
+        "hands": game.hands,
+        "elapsed": time.perf_counter() - start,
+        "solve_times": game.solve_times,
+        "solve_stats": game.solve_stats,
+        "store_hits": store.hits if store is not None else 0,
+        "evaluations": planner.evaluations if planner is not None else 0,
+    }
+
+
+def journal_path(store_path: str, seed: int) -> str:
+    """Get the journal a game appends its new solvability results to."""
+    return f"{store_path}.{seed}.journal"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run headless self-play games.")
+    parser.add_argument("-n", "--games", type=int, default=8)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("--max-hands", type=int, default=100)
+    parser.add_argument("--time-budget", type=float, default=0.5)
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="search for the best placement for this many ms per hand",
+    )
+    parser.add_argument(
+        "--lookahead",
+        type=int,
+        metavar="DEPTH",
+        help="pick placements by the solvability of DEPTH sampled future hands",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=8, help="future hands sampled per board"
+    )
+    parser.add_argument(
+        "--budget", type=float, default=200, help="lookahead time budget in ms"
+    )
+    parser.add_argument(
+        "--store",
+        metavar="PATH",
+        help="share solvability results between games through a file",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="DIR",
+        help="record every game to a binary log in this directory",
+    )
+    parser.add_argument(
+        "--stats", metavar="PATH", help="write solver stats of every solve as JSONL"
+    )
+    args = parser.parse_args()
+
+    seeds = range(args.seed, args.seed + args.games)
+    lookahead = None
+    if args.lookahead is not None:
+        lookahead = (args.lookahead, args.samples, args.budget)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = list(
+            executor.map(
+                run_game,
+                seeds,
+                [args.max_hands] * args.games,
+                [args.time_budget] * args.games,
+                [args.stats is not None] * args.games,
+                [args.deadline] * args.games,
+                [args.store] * args.games,
+                [args.record] * args.games,
+                [lookahead] * args.games,
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    moves = sum(r["moves"] for r in results)
+    solve_times = [t * 1000 for r in results for t in r["solve_times"]]
+    print(f"games:      {len(results)} in {elapsed:.2f}s")
+    print(f"games/s:    {len(results) / elapsed:.2f}")
+    print(f"moves/s:    {moves / elapsed:.1f}")
+    print(f"avg score:  {sum(r['score'] for r in results) / len(results):.1f}")
+    print(f"avg hands:  {sum(r['hands'] for r in results) / len(results):.1f}")
+    print(
+        "solve ms:   "
+        + " ".join(f"p{q}={percentile(solve_times, q):.2f}" for q in (50, 90, 99, 100))
+    )
+
+    if lookahead is not None:
+        evaluations = sum(r["evaluations"] for r in results)
+        print(f"lookahead:  {evaluations} evaluations")
+
+    if args.store is not None:
+        journals = [journal_path(args.store, seed) for seed in seeds]
+        records = compact(args.store, [j for j in journals if os.path.exists(j)])
+        hits = sum(r["store_hits"] for r in results)
+        print(f"store:      {records} records, {hits} hits")
+
+    if args.stats is not None:
+        with open(args.stats, "w") as f:
+            for r in results:
+                for record in r["solve_stats"]:
+                    f.write(json.dumps({"seed": r["seed"], **record}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
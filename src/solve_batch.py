@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Iterator, Optional, TextIO
+
+from block import Block
+from selection import Selection
+from grid import Grid
+from bitgrid import BitGrid
+from pruning import Pruner
+from solver import SolverInterrupted, solve
+from transposition import TranspositionTable
+
+
+GRID_TYPES = {"list": Grid, "bitboard": BitGrid}
+
+
+def parse_grid(rows: list, grid_type: type = Grid) -> Grid:
+    """Build a grid from rows of 0/1 cells or strings with '#' or '1' for tiles."""
+    values = [
+        [int(c in "#1") for c in row] if isinstance(row, str) else [int(c) for c in row]
+        for row in rows
+    ]
+    if any(len(row) != len(values) for row in values):
+        raise ValueError("Grid must be square.")
+    return grid_type(len(values), values)
+
+
+def parse_block(item: str | list | dict) -> Block:
+    """Build a block from a name, rows of cells, or a name with a rotation."""
+    if isinstance(item, dict):
+        return Block(item["name"], rotation=item.get("rotation", 0))
+    return Block(item)
+
+
+def solve_record(
+    index: int, line: str, grid_type: type, timeout: Optional[float], pruning: bool
+) -> dict:
+    """Solve one JSON position and describe the outcome as a JSON-ready dict."""
+    start = time.perf_counter()
+    result: dict[str, Any] = {"index": index}
+    try:
+        record = json.loads(line)
+        if "id" in record:
+            result["id"] = record["id"]
+        grid = parse_grid(record["grid"], grid_type)
+        hand = [parse_block(item) for item in record["hand"]]
+        if not hand:
+            raise ValueError("Hand must hold at least one block.")
+        deadline = start + timeout if timeout is not None else None
+
+        def stop() -> bool:
+            return deadline is not None and time.perf_counter() > deadline
+
+        solution = solve(
+            grid,
+            Selection(hand, grid.size, len(hand)),
+            TranspositionTable(),
+            stop if deadline is not None else None,
+            Pruner() if pruning else None,
+        )
+        result["solvable"] = solution is not None
+        if solution is not None:
+            result["solution"] = [
+                {"block": [list(row) for row in block.key], "position": list(position)}
+                for block, position in solution
+            ]
+    except SolverInterrupted:
+        result["solvable"] = None
+        result["timeout"] = True
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def read_lines(file: TextIO) -> Iterator[str]:
+    """Yield the non-blank lines of a JSONL stream."""
+    for line in file:
+        if line.strip():
+            yield line
+
+
+class BatchStats:
+    def __init__(self) -> None:
+        """Initialize running counters that do not grow with the input."""
+        self.positions: int = 0
+        self.solvable: int = 0
+        self.unsolvable: int = 0
+        self.timeouts: int = 0
+        self.errors: int = 0
+        self.solve_time: float = 0.0
+        self.max_time: float = 0.0
+
+    def add(self, result: dict) -> None:
+        """Count the outcome of one position."""
+        self.positions += 1
+        if "error" in result:
+            self.errors += 1
+        elif result.get("timeout"):
+            self.timeouts += 1
+        elif result["solvable"]:
+            self.solvable += 1
+        else:
+            self.unsolvable += 1
+        self.solve_time += result["elapsed"]
+        self.max_time = max(self.max_time, result["elapsed"])
+
+    def report(self, elapsed: float) -> str:
+        """Summarize the throughput and outcomes of the batch."""
+        mean = self.solve_time / self.positions if self.positions else 0.0
+        return (
+            f"positions:  {self.positions} in {elapsed:.2f}s "
+            f"({self.positions / elapsed if elapsed else 0.0:.1f}/s)\n"
+            f"solvable:   {self.solvable}\n"
+            f"unsolvable: {self.unsolvable}\n"
+            f"timeouts:   {self.timeouts}\n"
+            f"errors:     {self.errors}\n"
+            f"solve ms:   mean={mean * 1000:.2f} max={self.max_time * 1000:.2f}"
+        )
+
+
+def solve_stream(
+    lines: Iterator[str],
+    executor: ProcessPoolExecutor,
+    max_pending: int,
+    ordered: bool = True,
+    grid_type: type = Grid,
+    timeout: Optional[float] = None,
+    pruning: bool = False,
+) -> Iterator[dict]:
+    """Fan positions out to a pool and yield their results as they are ready.
+
+    At most `max_pending` positions are submitted or waiting to be emitted at a
+    time, so input is only read as fast as results are consumed. Results come
+    back in input order when `ordered`, otherwise in completion order.
+    """
+    pending: set[Future] = set()
+    done_results: dict[int, dict] = {}
+    next_index = 0
+    numbered = enumerate(lines)
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) + len(done_results) < max_pending:
+            item = next(numbered, None)
+            if item is None:
+                exhausted = True
+                break
+            index, line = item
+            pending.add(
+                executor.submit(solve_record, index, line, grid_type, timeout, pruning)
+            )
+        if not pending and not done_results:
+            return
+
+        if pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if ordered:
+                    done_results[result["index"]] = result
+                else:
+                    yield result
+        while next_index in done_results:
+            yield done_results.pop(next_index)
+            next_index += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Solve a JSONL stream of positions with a pool of processes.",
+        epilog='Each line is like {"id": 1, "grid": ["..#.....", ...], '
+        '"hand": ["L", {"name": "T", "rotation": 90}, [[1, 1]]]}.',
+    )
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file or -")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file or -")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=None,
+        help="positions in flight at once, 4 per worker by default",
+    )
+    parser.add_argument(
+        "-t", "--timeout", type=float, default=None, help="seconds per position"
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="write results as they complete instead of in input order",
+    )
+    parser.add_argument("--engine", choices=GRID_TYPES, default="bitboard")
+    parser.add_argument(
+        "-p", "--prune", action="store_true", help="enable the pruning rules"
+    )
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    stats = BatchStats()
+    start = time.perf_counter()
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        max_pending = args.max_pending or 4 * workers
+        for result in solve_stream(
+            read_lines(source),
+            executor,
+            max_pending,
+            not args.unordered,
+            GRID_TYPES[args.engine],
+            args.timeout,
+            args.prune,
+        ):
+            stats.add(result)
+            sink.write(json.dumps(result) + "\n")
+    sink.flush()
+    print(stats.report(time.perf_counter() - start), file=sys.stderr)
+
+    if source is not sys.stdin:
+        source.close()
+    if sink is not sys.stdout:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
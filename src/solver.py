@@ -1,60 +1,277 @@
+import time
+from typing import Callable, Generator, Iterator, Optional
+
 from block import Block
 from selection import Selection
 from grid import Grid
+from pruning import Pruner
+from transposition import TranspositionTable
+
+
+class SolverInterrupted(Exception):
+    """Raised inside the search when its stop condition is met."""
+
+
+class SolverStats:
+    def __init__(
+        self, on_node: Optional[Callable[[int, Grid, list[Block]], None]] = None
+    ) -> None:
+        """Initialize the counters of a search and an optional per-node hook."""
+        self.on_node: Optional[Callable[[int, Grid, list[Block]], None]] = on_node
+        self.nodes: int = 0
+        self.placements: int = 0
+        self.clear_evaluations: int = 0
+        self.cache_hits: int = 0
+        self.dead_ends: int = 0
+        self.depth_times: list[float] = []
+        self.elapsed: float = 0.0
+
+    def add(self, other: "SolverStats") -> None:
+        """Accumulate the counters of another search."""
+        self.nodes += other.nodes
+        self.placements += other.placements
+        self.clear_evaluations += other.clear_evaluations
+        self.cache_hits += other.cache_hits
+        self.dead_ends += other.dead_ends
+        for depth, elapsed in enumerate(other.depth_times):
+            self.add_depth_time(depth, elapsed)
+        self.elapsed += other.elapsed
+
+    def add_depth_time(self, depth: int, elapsed: float) -> None:
+        """Add wall time spent in a node at a depth, including its subtree."""
+        while len(self.depth_times) <= depth:
+            self.depth_times.append(0.0)
+        self.depth_times[depth] += elapsed
+
+    def as_dict(self) -> dict:
+        """Get the counters as a JSON-serializable dict."""
+        return {
+            "nodes": self.nodes,
+            "placements": self.placements,
+            "clear_evaluations": self.clear_evaluations,
+            "cache_hits": self.cache_hits,
+            "dead_ends": self.dead_ends,
+            "depth_times": self.depth_times,
+            "elapsed": self.elapsed,
+        }
+
+    def __repr__(self):
+        return (
+            f"SolverStats({self.nodes} nodes, {self.placements} placements, "
+            f"{self.clear_evaluations} clear evaluations, {self.cache_hits} cache "
+            f"hits, {self.dead_ends} dead ends, {self.elapsed:.3f}s)"
+        )
 
 
-def solve(grid, blocks):
-    return backtrack(grid, blocks, [])
+def solve(
+    grid,
+    blocks,
+    cache: TranspositionTable | None = None,
+    stop: Optional[Callable[[], bool]] = None,
+    pruner: Optional[Pruner] = None,
+    stats: Optional[SolverStats] = None,
+):
+    if stats is None:
+        return backtrack(grid, list(blocks.blocks), [], cache, stop, pruner)
+    start = time.perf_counter()
+    try:
+        return backtrack(grid, list(blocks.blocks), [], cache, stop, pruner, stats)
+    finally:
+        stats.elapsed += time.perf_counter() - start
 
 
 def backtrack(
-    grid: Grid, selection: Selection, placements: list[tuple[Block, tuple[int, int]]]
+    grid: Grid,
+    blocks: list[Block],
+    placements: list[tuple[Block, tuple[int, int]]],
+    cache: TranspositionTable | None = None,
+    stop: Optional[Callable[[], bool]] = None,
+    pruner: Optional[Pruner] = None,
+    stats: Optional[SolverStats] = None,
 ) -> list[tuple[Block, tuple[int, int]]] | None:
-    if not any(grid.can_place(b) for b in selection.blocks):
-        return None
+    if stats is None:
+        return expand(grid, blocks, placements, cache, stop, pruner, None)
 
-    prev_grid = grid.copy()
+    depth = len(placements)
+    stats.nodes += 1
+    if stats.on_node is not None:
+        stats.on_node(depth, grid, blocks)
+    start = time.perf_counter()
+    try:
+        return expand(grid, blocks, placements, cache, stop, pruner, stats)
+    finally:
+        stats.add_depth_time(depth, time.perf_counter() - start)
 
-    for idx in range(len(selection.blocks)):
-        block = selection.blocks[idx]
 
-        possible_positions = [
-            (y, x)
-            for y in range(grid.size - block.height + 1)
-            for x in range(grid.size - block.width + 1)
-        ]
-        possible_positions.sort(
-            reverse=True, key=lambda p: get_num_cleared(grid, block, p)
-        )
+def expand(
+    grid: Grid,
+    blocks: list[Block],
+    placements: list[tuple[Block, tuple[int, int]]],
+    cache: TranspositionTable | None,
+    stop: Optional[Callable[[], bool]],
+    pruner: Optional[Pruner],
+    stats: Optional[SolverStats],
+) -> list[tuple[Block, tuple[int, int]]] | None:
+    if stop is not None and stop():
+        raise SolverInterrupted()
+
+    if cache is not None:
+        key = cache.key(grid, blocks)
+        if cache.is_dead(key):
+            if stats is not None:
+                stats.cache_hits += 1
+            return None
+
+    legal_positions = [grid.legal_positions(b) for b in blocks]
+    if not any(legal_positions) or (
+        pruner is not None and pruner.prune(grid, blocks, legal_positions)
+    ):
+        if stats is not None:
+            stats.dead_ends += 1
+        if cache is not None:
+            cache.mark_dead(key)
+        return None
+
+    recurse = expand if stats is None else backtrack
+    for idx, block in enumerate(blocks):
+        remaining = blocks[:idx] + blocks[idx + 1 :]
+
+        possible_positions = order_positions(grid, block, legal_positions[idx])
+        if stats is not None:
+            stats.clear_evaluations += len(possible_positions)
 
         for position in possible_positions:
-            if grid.can_place(block, position):
-                grid.place(block, position)
+            move = grid.play(block, position)
+            if stats is not None:
+                stats.placements += 1
+            placements.append((block, position))
+
+            if not remaining:
+                return placements
+
+            if result := recurse(
+                grid, remaining, placements, cache, stop, pruner, stats
+            ):
+                return result
+
+            grid.undo(move)
+            placements.pop()
+
+    if cache is not None:
+        cache.mark_dead(key)
+    return None
+
+
+def iter_solutions(
+    grid: Grid,
+    selection: Selection,
+    cache: TranspositionTable | None = None,
+    stop: Optional[Callable[[], bool]] = None,
+    pruner: Optional[Pruner] = None,
+    unique: bool = False,
+    limit: Optional[int] = None,
+    stats: Optional[SolverStats] = None,
+) -> Iterator[list[tuple[Block, tuple[int, int]]]]:
+    """Lazily yield every placement of the hand, in the order `solve` tries them.
+
+    With `unique`, placements reaching an already seen final board are skipped.
+    The grid shows the final board of each yielded placement and is restored once
+    the generator is exhausted or closed. Stats count nodes, placements, cache
+    hits and dead ends but no depth times, since the search pauses at each yield.
+    """
+    if limit is not None and limit <= 0:
+        return
+    seen = set()
+    count = 0
+    for placements in iter_backtrack(
+        grid, list(selection.blocks), [], cache, stop, pruner, stats
+    ):
+        if unique:
+            board = grid.occupancy()
+            if board in seen:
+                continue
+            seen.add(board)
+        yield list(placements)
+        count += 1
+        if limit is not None and count >= limit:
+            return
 
-                placements.append((block, position))
-                grid.clear_full()
-                selection.blocks.pop(idx)
 
-                if not len(selection.blocks):
-                    return placements
+def iter_backtrack(
+    grid: Grid,
+    blocks: list[Block],
+    placements: list[tuple[Block, tuple[int, int]]],
+    cache: TranspositionTable | None = None,
+    stop: Optional[Callable[[], bool]] = None,
+    pruner: Optional[Pruner] = None,
+    stats: Optional[SolverStats] = None,
+) -> Generator[list[tuple[Block, tuple[int, int]]], None, bool]:
+    """Yield every completion of the placements and return whether there was one."""
+    if stop is not None and stop():
+        raise SolverInterrupted()
+    if stats is not None:
+        stats.nodes += 1
+        if stats.on_node is not None:
+            stats.on_node(len(placements), grid, blocks)
 
-                if result := backtrack(grid, selection, placements):
-                    return result
+    if cache is not None:
+        key = cache.key(grid, blocks)
+        if cache.is_dead(key):
+            if stats is not None:
+                stats.cache_hits += 1
+            return False
 
-                selection.blocks.insert(idx, block)
-                for r in range(grid.size):
-                    for c in range(grid.size):
-                        grid.values[r][c] = prev_grid.values[r][c]
+    legal_positions = [grid.legal_positions(b) for b in blocks]
+    if not any(legal_positions) or (
+        pruner is not None and pruner.prune(grid, blocks, legal_positions)
+    ):
+        if stats is not None:
+            stats.dead_ends += 1
+        if cache is not None:
+            cache.mark_dead(key)
+        return False
+
+    found = False
+    for idx, block in enumerate(blocks):
+        remaining = blocks[:idx] + blocks[idx + 1 :]
+
+        possible_positions = order_positions(grid, block, legal_positions[idx])
+        if stats is not None:
+            stats.clear_evaluations += len(possible_positions)
+
+        for position in possible_positions:
+            move = grid.play(block, position)
+            if stats is not None:
+                stats.placements += 1
+            placements.append((block, position))
+            try:
+                if not remaining:
+                    found = True
+                    yield placements
+                else:
+                    found |= yield from iter_backtrack(
+                        grid, remaining, placements, cache, stop, pruner, stats
+                    )
+            finally:
+                grid.undo(move)
                 placements.pop()
 
-    return None
+    if not found and cache is not None:
+        cache.mark_dead(key)
+    return found
 
 
-def get_num_cleared(grid: Grid, block: Block, position: tuple) -> int:
-    grid_copy = grid.copy()
+def order_positions(
+    grid: Grid, block: Block, positions: list[tuple[int, int]]
+) -> list[tuple[int, int]]:
+    """Sort positions so the ones clearing the most lines are tried first."""
+    positions.sort(reverse=True, key=lambda p: grid.count_cleared(block, p))
+    return positions
 
-    if grid_copy.place(block, position):
-        return grid_copy.clear_full()
+
+def get_num_cleared(grid: Grid, block: Block, position: tuple) -> int:
+    if grid.can_place(block, position):
+        return grid.count_cleared(block, position)
     return -1
 
 
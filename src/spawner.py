@@ -0,0 +1,180 @@
+import random
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+from config import DEFAULT_HAND_SIZE
+from block import Block, Shape
+from selection import Selection
+from grid import Grid
+from solver import solve
+from symmetry import canonical, symmetries
+from transposition import TranspositionTable
+
+if TYPE_CHECKING:
+    from parallel import ParallelSolver
+    from store import SolvabilityStore
+
+
+FALLBACKS = ("random", "smallest", "exhaustive")
+
+
+class SpawnStats:
+    def __init__(self) -> None:
+        """Initialize the counters of a spawn search."""
+        self.spawns: int = 0
+        self.hands_tried: int = 0
+        self.memo_hits: int = 0
+        self.timeouts: int = 0
+        self.elapsed: float = 0.0
+        self.search: float = 0.0
+
+    def add(self, other: "SpawnStats") -> None:
+        """Accumulate the counters of another spawn search."""
+        self.spawns += other.spawns
+        self.hands_tried += other.hands_tried
+        self.memo_hits += other.memo_hits
+        self.timeouts += other.timeouts
+        self.elapsed += other.elapsed
+        self.search += other.search
+
+    def __repr__(self):
+        return (
+            f"SpawnStats({self.spawns} spawns, {self.hands_tried} hands tried, "
+            f"{self.memo_hits} memo hits, {self.timeouts} timeouts, "
+            f"{self.elapsed:.3f}s, {self.search:.3f}s completing)"
+        )
+
+
+class Spawner:
+    def __init__(
+        self,
+        hand_size: int = DEFAULT_HAND_SIZE,
+        time_budget: float = 0.5,
+        fallback: str = "smallest",
+        cache: Optional[TranspositionTable] = None,
+        rng: Optional[random.Random] = None,
+        solver: Optional["ParallelSolver"] = None,
+        store: Optional["SolvabilityStore"] = None,
+    ) -> None:
+        """Initialize a generator of solvable hands."""
+        if fallback not in FALLBACKS:
+            raise ValueError(
+                f"Fallback '{fallback}' must be one of {', '.join(FALLBACKS)}."
+            )
+        self.hand_size: int = hand_size
+        self.time_budget: float = time_budget
+        self.fallback: str = fallback
+        self.cache: TranspositionTable = (
+            cache if cache is not None else TranspositionTable()
+        )
+        self.rng: random.Random = rng if rng is not None else random.Random()
+        self.solver: Optional["ParallelSolver"] = solver
+        self.store: Optional["SolvabilityStore"] = store
+        self.last_stats: SpawnStats = SpawnStats()
+        self.total_stats: SpawnStats = SpawnStats()
+
+        self.weight: dict[Shape, int] = Shape.catalogue()
+        self.shapes: list[Block] = [Block(shape) for shape in self.weight]
+        self.weights: list[int] = list(self.weight.values())
+
+    def spawn(
+        self, grid: Grid, stop: Optional[Callable[[], bool]] = None
+    ) -> list[Block]:
+        """Generate a random hand that can be fully placed on the grid."""
+        stats = SpawnStats()
+        stats.spawns = 1
+        start = time.perf_counter()
+
+        candidates = self.shuffled(grid.placeable(self.shapes))
+        if not candidates:
+            hand = self.rng.choices(self.shapes, self.weights, k=self.hand_size)
+        else:
+            deadline = None
+            if self.fallback != "exhaustive":
+                deadline = start + self.time_budget
+            hand = [candidates[0]]
+            stabilizer = symmetries(grid.occupancy(), grid.size)
+            search = time.perf_counter()
+            completed = self.complete(
+                grid.copy(), hand, candidates, deadline, stats, {}, stop, stabilizer
+            )
+            stats.search = time.perf_counter() - search
+            if not completed:
+                stats.timeouts = 1
+                hand = self.fallback_hand(candidates)
+
+        stats.elapsed = time.perf_counter() - start
+        self.last_stats = stats
+        self.total_stats.add(stats)
+        return [block.copy() for block in hand]
+
+    def shuffled(self, blocks: list[Block]) -> list[Block]:
+        """Shuffle shapes weighted by how many rotations produce them."""
+        return sorted(
+            blocks,
+            key=lambda b: self.rng.random() ** (1 / self.weight[b.shape]),
+            reverse=True,
+        )
+
+    def complete(
+        self,
+        grid: Grid,
+        hand: list[Block],
+        candidates: list[Block],
+        deadline: Optional[float],
+        stats: SpawnStats,
+        memo: dict[tuple[int, ...], bool],
+        stop: Optional[Callable[[], bool]] = None,
+        stabilizer: tuple[int, ...] = (0,),
+    ) -> bool:
+        """Append candidates to the hand until it is full and solvable.
+
+        Every slot walks its own weighted shuffle of the candidates, so the slots
+        of a hand are drawn independently like `Selection.spawn` deals them.
+        Hands are memoised by their representative under the symmetries that
+        leave the board unchanged, since such hands are equally solvable.
+        """
+        if len(hand) == self.hand_size:
+            shapes = [b.shape for b in hand]
+            key = canonical(0, grid.size, shapes, stabilizer)[1]
+            if key in memo:
+                stats.memo_hits += 1
+                return memo[key]
+            if self.store is not None:
+                known = self.store.lookup(grid, hand)
+                if known is not None:
+                    memo[key] = known
+                    return known
+            stats.hands_tried += 1
+            board = grid.copy() if self.store is not None else grid
+            if self.solver is not None:
+                solution = self.solver.solve(
+                    board, Selection(hand[:]), self.cache, stop
+                )
+            else:
+                solution = solve(board, Selection(hand[:]), self.cache, stop)
+            memo[key] = solution is not None
+            if self.store is not None:
+                self.store.record(grid, hand, memo[key])
+            return memo[key]
+
+        for block in self.shuffled(candidates):
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            hand.append(block)
+            if self.complete(
+                grid, hand, candidates, deadline, stats, memo, stop, stabilizer
+            ):
+                return True
+            hand.pop()
+
+        return False
+
+    def fallback_hand(self, candidates: list[Block]) -> list[Block]:
+        """Pick a hand without proving it solvable once the budget runs out."""
+        if self.fallback == "random":
+            return [candidates[0]] + self.rng.choices(candidates, k=self.hand_size - 1)
+        smallest = sorted(candidates, key=lambda b: b.tile_count)
+        return [candidates[0]] + [
+            smallest[i % len(smallest)] for i in range(self.hand_size - 1)
+        ]
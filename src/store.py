@@ -0,0 +1,185 @@
+import mmap
+import os
+import struct
+from typing import Optional
+
+from config import DEFAULT_GRID_SIZE, DEFAULT_HAND_SIZE
+from block import Block, Shape
+from grid import Grid
+from symmetry import TRANSFORMS, transform_mask, transform_shape
+
+
+MAGIC = b"BBSC"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBxI")
+EMPTY = 0xFF
+
+
+class SolvabilityStore:
+    def __init__(
+        self,
+        path: str,
+        size: int = DEFAULT_GRID_SIZE,
+        hand_size: int = DEFAULT_HAND_SIZE,
+        journal: Optional[str] = None,
+    ) -> None:
+        """Open a sorted file of solvability records, memory-mapped read-only.
+
+        Every record is the occupancy of a board in `ceil(size**2 / 8)` bytes,
+        the catalogue indices of the hand sorted and padded to `hand_size` bytes,
+        and one byte telling if the hand can be fully placed. New results are
+        appended unsorted to the journal, if any, and folded in by `compact`.
+        """
+        self.path: str = path
+        self.size: int = size
+        self.hand_size: int = hand_size
+        self.board_bytes: int = (size * size + 7) // 8
+        self.key_size: int = self.board_bytes + hand_size
+        self.record_size: int = self.key_size + 1
+        self.shape_index: dict[Shape, int] = {
+            shape: i for i, shape in enumerate(Shape.catalogue())
+        }
+        self.pending: dict[bytes, bool] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self.data: Optional[mmap.mmap] = None
+        self.count: int = 0
+        if os.path.exists(path) and os.path.getsize(path) > HEADER.size:
+            with open(path, "rb") as f:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, size, hand_size, count = HEADER.unpack_from(self.data)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a solvability store.")
+            if (size, hand_size) != (self.size, self.hand_size):
+                raise ValueError(
+                    f"{path} holds {size}x{size} boards with hands of {hand_size}."
+                )
+            self.count = count
+
+        self.journal = open(journal, "ab") if journal is not None else None
+
+    def encode(self, grid: Grid, blocks: list[Block]) -> Optional[bytes]:
+        """Encode a board and hand as a record key, or None if it cannot be stored.
+
+        The key is the smallest encoding among the rotations and reflections of
+        the position whose shapes are all in the catalogue, so symmetric
+        positions share one record.
+        """
+        if grid.size != self.size or len(blocks) > self.hand_size:
+            return None
+        occupancy = grid.occupancy()
+        best = None
+        for t in TRANSFORMS:
+            shapes = [transform_shape(b.shape, t) for b in blocks]
+            if any(shape not in self.shape_index for shape in shapes):
+                continue
+            hand = sorted(self.shape_index[shape] for shape in shapes)
+            hand += [EMPTY] * (self.hand_size - len(hand))
+            mask = transform_mask(occupancy, self.size, t)
+            key = mask.to_bytes(self.board_bytes, "little") + bytes(hand)
+            if best is None or key < best:
+                best = key
+        return best
+
+    def lookup(self, grid: Grid, blocks: list[Block]) -> Optional[bool]:
+        """Check if a hand is known to be solvable on a board, or None if unknown."""
+        key = self.encode(grid, blocks)
+        if key is None:
+            return None
+        result = self.pending.get(key)
+        if result is None:
+            result = self.search(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def search(self, key: bytes) -> Optional[bool]:
+        """Binary search the memory-mapped records for a key."""
+        if self.data is None:
+            return None
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = HEADER.size + mid * self.record_size
+            probe = self.data[start : start + self.key_size]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return self.data[start + self.key_size] == 1
+        return None
+
+    def record(self, grid: Grid, blocks: list[Block], solvable: bool) -> None:
+        """Remember a result and append it to the journal."""
+        key = self.encode(grid, blocks)
+        if key is None or key in self.pending:
+            return
+        self.pending[key] = solvable
+        if self.journal is not None:
+            self.journal.write(key + bytes([solvable]))
+
+    def close(self) -> None:
+        """Flush the journal and unmap the records."""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self):
+        return (
+            f"SolvabilityStore({self.count} records, {len(self.pending)} pending, "
+            f"{self.hits} hits, {self.misses} misses)"
+        )
+
+
+def compact(
+    path: str,
+    journals: list[str],
+    size: int = DEFAULT_GRID_SIZE,
+    hand_size: int = DEFAULT_HAND_SIZE,
+) -> int:
+    """Merge journals into the sorted store file and return its record count.
+
+    The merged file is written next to the store and renamed over it, so readers
+    that mapped the old file keep a consistent view.
+    """
+    record_size = (size * size + 7) // 8 + hand_size + 1
+    records: dict[bytes, bytes] = {}
+    sources = ([path] if os.path.exists(path) else []) + journals
+    for source in sources:
+        with open(source, "rb") as f:
+            data = f.read()
+        offset = 0
+        if source == path and data:
+            magic, version, file_size, file_hand, count = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a solvability store.")
+            if (file_size, file_hand) != (size, hand_size):
+                raise ValueError(
+                    f"{path} holds {file_size}x{file_size} boards with hands of "
+                    f"{file_hand}."
+                )
+            offset = HEADER.size
+        end = offset + (len(data) - offset) // record_size * record_size
+        for start in range(offset, end, record_size):
+            record = data[start : start + record_size]
+            records[record[:-1]] = record[-1:]
+
+    temp = f"{path}.tmp"
+    with open(temp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, hand_size, len(records)))
+        for key in sorted(records):
+            f.write(key + records[key])
+    os.replace(temp, path)
+    for journal in journals:
+        os.remove(journal)
+    return len(records)
@@ -0,0 +1,116 @@
+from functools import lru_cache
+from typing import Optional
+
+from block import Shape
+
+
+TRANSFORMS = range(8)
+TABLE_MAX_SIZE = 10
+
+
+def transform_cell(i: int, j: int, height: int, width: int, t: int) -> tuple[int, int]:
+    """Map a cell of a height x width rectangle by one of the 8 symmetries of D4.
+
+    0-3 rotate clockwise by 0, 90, 180 and 270 degrees, 4 mirrors left to right,
+    5 transposes, 6 mirrors top to bottom and 7 transposes along the other
+    diagonal. Odd transforms swap the height and width of the rectangle.
+    """
+    return (
+        (i, j),
+        (j, height - 1 - i),
+        (height - 1 - i, width - 1 - j),
+        (width - 1 - j, i),
+        (i, width - 1 - j),
+        (j, i),
+        (height - 1 - i, j),
+        (width - 1 - j, height - 1 - i),
+    )[t]
+
+
+@lru_cache(maxsize=None)
+def row_tables(size: int) -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """Map every row value of every row to its transformed cells, per transform."""
+    tables = []
+    for t in TRANSFORMS:
+        rows = []
+        for y in range(size):
+            values = []
+            for value in range(1 << size):
+                mask = 0
+                for x in range(size):
+                    if value >> x & 1:
+                        i, j = transform_cell(y, x, size, size, t)
+                        mask |= 1 << (i * size + j)
+                values.append(mask)
+            rows.append(tuple(values))
+        tables.append(tuple(rows))
+    return tuple(tables)
+
+
+@lru_cache(maxsize=None)
+def cell_tables(size: int) -> tuple[tuple[int, ...], ...]:
+    """Map every cell index to its transformed cell index, per transform."""
+    tables = []
+    for t in TRANSFORMS:
+        cells = []
+        for y in range(size):
+            for x in range(size):
+                i, j = transform_cell(y, x, size, size, t)
+                cells.append(i * size + j)
+        tables.append(tuple(cells))
+    return tuple(tables)
+
+
+def transform_mask(mask: int, size: int, t: int) -> int:
+    """Transform an occupancy bitmask one row at a time, or one cell on big boards."""
+    if size > TABLE_MAX_SIZE:
+        cells = cell_tables(size)[t]
+        result = 0
+        while mask:
+            low = mask & -mask
+            result |= 1 << cells[low.bit_length() - 1]
+            mask ^= low
+        return result
+    rows = row_tables(size)[t]
+    full = (1 << size) - 1
+    result = 0
+    for y in range(size):
+        result |= rows[y][mask >> (y * size) & full]
+    return result
+
+
+@lru_cache(maxsize=None)
+def transform_shape(shape: Shape, t: int) -> Shape:
+    """Get the shape transformed by a symmetry."""
+    height, width = shape.height, shape.width
+    if t % 2:
+        height, width = width, height
+    rows = [[0] * width for _ in range(height)]
+    for i, j in shape.cells:
+        y, x = transform_cell(i, j, shape.height, shape.width, t)
+        rows[y][x] = 1
+    return Shape(rows)
+
+
+def symmetries(mask: int, size: int) -> tuple[int, ...]:
+    """Get the transforms that leave a board unchanged."""
+    return tuple(t for t in TRANSFORMS if transform_mask(mask, size, t) == mask)
+
+
+def canonical(
+    mask: int, size: int, shapes: list[Shape], transforms: Optional[tuple] = None
+) -> tuple[int, tuple[int, ...]]:
+    """Get the smallest (board, sorted shape ids) among the transforms of a position.
+
+    Positions related by a symmetry of the square share this representative, and
+    so do their solvability and cache entries.
+    """
+    best = (mask, tuple(sorted(s.id for s in shapes)))
+    for t in TRANSFORMS if transforms is None else transforms:
+        key = (
+            transform_mask(mask, size, t),
+            tuple(sorted(transform_shape(s, t).id for s in shapes)),
+        )
+        if key < best:
+            best = key
+    return best
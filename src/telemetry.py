@@ -0,0 +1,193 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+from typing import Optional, Sequence
+
+
+BUCKETS_MS = (1, 2, 4, 8, 16, 33, 50, 100, 250, 500, 1000, 5000)
+METRICS = ("frame", "render", "input", "solve", "spawn", "complete")
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Get the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+class Histogram:
+    def __init__(self, window: int = 240) -> None:
+        """Initialize a latency histogram with a rolling window for percentiles.
+
+        Every sample is counted in fixed millisecond buckets for the whole run,
+        and the last `window` samples are kept for live percentiles.
+        """
+        self.buckets: list[int] = [0] * (len(BUCKETS_MS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+
+    def add(self, ms: float) -> None:
+        """Count a sample in milliseconds."""
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.recent.append(ms)
+
+    def percentile(self, q: float) -> float:
+        """Get the nearest-rank percentile of the recent samples."""
+        return percentile(self.recent, q)
+
+    @property
+    def mean(self) -> float:
+        """Get the mean of all samples."""
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, name: str) -> dict[str, float]:
+        """Summarize the samples as flat columns prefixed by the metric name."""
+        return {
+            f"{name}_count": self.count,
+            f"{name}_mean_ms": round(self.mean, 3),
+            f"{name}_p50_ms": round(self.percentile(50), 3),
+            f"{name}_p99_ms": round(self.percentile(99), 3),
+            f"{name}_max_ms": round(self.max, 3),
+        }
+
+    def __repr__(self):
+        return f"{self.percentile(50):.1f}/{self.percentile(99):.1f}"
+
+
+class Telemetry:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        interval: float = 5.0,
+        window: int = 240,
+        refresh: float = 0.25,
+    ) -> None:
+        """Initialize frame, input, solver and spawner metrics of the game loop.
+
+        Snapshots are appended to `path` every `interval` seconds, as CSV rows
+        if it ends with .csv and as JSON lines with the bucket counts otherwise.
+        The overlay text is rebuilt every `refresh` seconds at most.
+        """
+        self.path: Optional[str] = path
+        self.interval: float = interval
+        self.refresh: float = refresh
+        self.histograms: dict[str, Histogram] = {
+            name: Histogram(window) for name in METRICS
+        }
+        self.frames: int = 0
+        self.frame_starts: deque[float] = deque(maxlen=window)
+        self.can_place_calls: int = 0
+        self.can_place_frames: deque[int] = deque(maxlen=window)
+        self.frame_start: float = 0.0
+        self.input_time: Optional[float] = None
+        self.started: float = time.perf_counter()
+        self.last_export: float = self.started
+        self.lines: list[str] = []
+        self.last_refresh: float = 0.0
+
+    def count_can_place(self) -> None:
+        """Count a `can_place` call of the current frame."""
+        self.can_place_calls += 1
+
+    def begin_frame(self) -> None:
+        """Mark the start of a frame."""
+        self.frame_start = time.perf_counter()
+        self.frame_starts.append(self.frame_start)
+
+    def input(self) -> None:
+        """Mark an input waiting for the next render, keeping the earliest."""
+        if self.input_time is None:
+            self.input_time = time.perf_counter()
+
+    def rendered(self, start: float) -> None:
+        """Record a render started at `start` and the input latency it ends."""
+        now = time.perf_counter()
+        self.record("render", now - start)
+        if self.input_time is not None:
+            self.record("input", now - self.input_time)
+            self.input_time = None
+
+    def record(self, name: str, seconds: float) -> None:
+        """Count a latency in seconds."""
+        self.histograms[name].add(seconds * 1000)
+
+    def end_frame(self) -> None:
+        """Record the frame time and can_place calls, exporting when due."""
+        now = time.perf_counter()
+        self.frames += 1
+        self.record("frame", now - self.frame_start)
+        self.can_place_frames.append(self.can_place_calls)
+        self.can_place_calls = 0
+        if self.path is not None and now - self.last_export >= self.interval:
+            self.export()
+            self.last_export = now
+
+    @property
+    def fps(self) -> float:
+        """Get the frame rate over the recent frames."""
+        if len(self.frame_starts) < 2:
+            return 0.0
+        span = self.frame_starts[-1] - self.frame_starts[0]
+        return (len(self.frame_starts) - 1) / span if span else 0.0
+
+    def snapshot(self) -> dict:
+        """Summarize every metric as flat columns."""
+        calls = self.can_place_frames
+        row = {
+            "time": round(time.perf_counter() - self.started, 3),
+            "frames": self.frames,
+            "fps": round(self.fps, 2),
+            "can_place_per_frame": round(sum(calls) / len(calls), 2) if calls else 0,
+            "can_place_max": max(calls, default=0),
+        }
+        for name, histogram in self.histograms.items():
+            row.update(histogram.summary(name))
+        return row
+
+    def export(self) -> None:
+        """Append a snapshot to the export file, if there is one."""
+        path = self.path
+        if path is None:
+            return
+        row = self.snapshot()
+        if path.endswith(".csv"):
+            new = not os.path.exists(path) or os.path.getsize(path) == 0
+            with open(path, "a", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                if new:
+                    writer.writeheader()
+                writer.writerow(row)
+            return
+        row["buckets_ms"] = list(BUCKETS_MS)
+        for name, histogram in self.histograms.items():
+            row[f"{name}_buckets"] = histogram.buckets
+        with open(path, "a") as f:
+            f.write(json.dumps(row) + "\n")
+
+    def overlay(self) -> list[str]:
+        """Get the live p50/p99 lines shown on screen."""
+        now = time.perf_counter()
+        if now - self.last_refresh < self.refresh:
+            return self.lines
+        self.last_refresh = now
+        h = self.histograms
+        calls = self.can_place_frames
+        self.lines = [
+            f"fps {self.fps:.1f}  frame {h['frame']}  render {h['render']}"
+            f"  input {h['input']} ms",
+            f"solve {h['solve']}  spawn {h['spawn']}  complete {h['complete']} ms",
+            f"can_place {sum(calls) / len(calls) if calls else 0:.1f}"
+            f"/{max(calls, default=0)} per frame",
+        ]
+        return self.lines
@@ -0,0 +1,83 @@
+import random
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Hashable
+
+from symmetry import canonical
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> tuple[int, ...]:
+    """Generate a fixed random 64-bit key for every cell of a grid size."""
+    rng = random.Random(size)
+    return tuple(rng.getrandbits(64) for _ in range(size * size))
+
+
+def zobrist_hash(mask: int, size: int) -> int:
+    """Combine the Zobrist keys of every cell set in a bitmask."""
+    keys = zobrist_keys(size)
+    h = 0
+    while mask:
+        low = mask & -mask
+        h ^= keys[low.bit_length() - 1]
+        mask ^= low
+    return h
+
+
+@lru_cache(maxsize=65536)
+def mask_hash(mask: int, size: int) -> int:
+    """Combine the Zobrist keys of a recurring bitmask such as a placement."""
+    return zobrist_hash(mask, size)
+
+
+class TranspositionTable:
+    def __init__(self, max_size: int = 100_000, symmetric: bool = False) -> None:
+        """Initialize an LRU cache of positions proven to have no solution.
+
+        A symmetric table keys positions by their representative under the
+        rotations and reflections of the board, so equivalent positions share
+        one entry at the cost of canonicalising every key.
+        """
+        self.max_size: int = max_size
+        self.symmetric: bool = symmetric
+        self.entries: OrderedDict[Hashable, None] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def key(self, grid, blocks: list) -> Hashable:
+        """Build the key of a grid and the multiset of remaining blocks."""
+        if self.symmetric:
+            shapes = [b.shape for b in blocks]
+            return grid.size, *canonical(grid.occupancy(), grid.size, shapes)
+        return grid.size, grid.zobrist, tuple(sorted(b.shape.id for b in blocks))
+
+    def is_dead(self, key: Hashable) -> bool:
+        """Check if a position is known to have no solution."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def mark_dead(self, key: Hashable) -> None:
+        """Record a position that has no solution."""
+        self.entries[key] = None
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self):
+        return (
+            f"TranspositionTable({len(self)}/{self.max_size} entries, "
+            f"{self.hits} hits, {self.misses} misses)"
+        )
@@ -0,0 +1,74 @@
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+from solver import SolverInterrupted
+
+
+class BackgroundWorker:
+    def __init__(self) -> None:
+        """Initialize a thread that runs solver requests off the game loop."""
+        self.requests: queue.Queue = queue.Queue()
+        self.results: queue.Queue = queue.Queue()
+        self.generation: int = 0
+        self.pending: Optional[str] = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    @property
+    def busy(self) -> bool:
+        """Check if a request is waiting for its result."""
+        return self.pending is not None
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args) -> None:
+        """Queue a request, making any earlier request stale."""
+        self.generation += 1
+        self.pending = kind
+        self.requests.put((self.generation, kind, fn, args))
+
+    def cancel(self, kind: Optional[str] = None) -> None:
+        """Drop the pending request, or only a request of the given kind."""
+        if self.pending is not None and kind in (None, self.pending):
+            self.generation += 1
+            self.pending = None
+
+    def poll(self) -> Optional[tuple[str, Any]]:
+        """Get the result of the pending request if it is ready."""
+        while True:
+            try:
+                generation, kind, result = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if generation != self.generation:
+                continue
+            self.pending = None
+            if isinstance(result, Exception):
+                raise result
+            return kind, result
+
+    def run(self) -> None:
+        """Process requests until the worker is closed."""
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            generation, kind, fn, args = request
+            if generation != self.generation:
+                continue
+
+            def stop() -> bool:
+                return generation != self.generation
+
+            try:
+                result = fn(*args, stop=stop)
+            except SolverInterrupted:
+                continue
+            except Exception as e:
+                result = e
+            self.results.put((generation, kind, result))
+
+    def close(self) -> None:
+        """Stop the worker thread."""
+        self.generation += 1
+        self.requests.put(None)
+        self.thread.join()